@@ -0,0 +1,27 @@
+"""
+常驻浏览器服务 - 在两次爬虫运行之间保持预热的 Chrome 实例
+
+爬虫启动时会自动通过调试端口连接其中空闲的实例（DAEMON_CONFIG["attach"]），
+省去每次冷启动 Chrome 和重新确认登录的时间。服务会定期做健康检查，
+实例无响应、退出或空闲时内存过大都会被重启。
+
+用法:
+  python browser_daemon.py
+
+建议配合 systemd service 常驻运行，爬虫仍由 timer 定时触发。
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.browser_daemon import BrowserDaemon
+
+
+def main():
+    BrowserDaemon().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -65,7 +65,11 @@ BROWSER_CONFIG = {
     "log_level": "3",
     "proxy_server": "http://127.0.0.1:7890",
     "page_load_strategy": "eager",
+    # selenium: 经 chromedriver 控制；cdp: 直接通过 DevTools websocket 控制，不需要 chromedriver
+    "driver_backend": "selenium",
     "chromedriver_path": None,
+    # 远程调试端口；并行 worker 依次使用 base, base+1, ...
+    "remote_debugging_port": 9222,
     # Linux headless 必要选项
     "disable_dev_shm_usage": True,
     "disable_setuid_sandbox": True,
@@ -78,21 +82,106 @@ BROWSER_CONFIG = {
     "disable_plugins": True,
     "disable_images": False,
     "disable_javascript": False,
-    "blink_settings": {"imagesEnabled": True}
+    "blink_settings": {"imagesEnabled": True},
+    # 通过 performance 日志捕获 armory API 的 XHR 响应，直接解析 JSON
+    "capture_network": True,
+    # 超时（秒）：单次 driver.get / execute_script 的上限
+    "page_load_timeout": 30,
+    "script_timeout": 30,
+    # 单个角色的硬上限，超时由 watchdog 强制结束 chromedriver 并重建浏览器
+    "character_deadline": 90,
+    # 浏览器回收：加载页面数或进程树内存超过阈值后重启浏览器（Cookie 自动带过去）
+    "recycle_after_pages": 150,
+    "recycle_rss_mb": 1200,
+    "recycle_check_interval": 5,  # 每隔几个页面检查一次内存
+    "disable_background_throttling": True,  # 多标签页并发时后台标签页不降频
+    # 通过 CDP Network.setBlockedURLs 拦截不需要的资源（图片、字体、媒体、统计/广告）
+    "blocked_url_patterns": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf",
+        "*.mp4", "*.webm", "*.mp3", "*.ogg",
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*hm.baidu.com*", "*cnzz.com*", "*.growingio.com*",
+    ],
 }
 
 # 爬虫配置
 CRAWLER_CONFIG = {
-    "max_attempts": 3,
-    "wait_time": 6,
-    "timeout": 10
+    "max_attempts": 3,  # 每个角色的最多尝试次数，失败的角色在主队列之后延后重试
+    "retry_base_delay": 3,  # 重试退避基数（秒），按 2^n 增长并加随机抖动
+    "retry_max_delay": 60,
+    "wait_time": 6,  # 初始等待上限（秒），积累样本后按 p95 自动调整
+    "ready_timeout_min": 2,
+    "ready_timeout_max": 15,  # 单页等待的硬上限
+    "ready_p95_margin": 1.5,
+    "ready_min_samples": 5,
+    "timeout": 10,
+    # hash: SPA 只加载一次，之后修改 location.hash 切换角色；reload: 每个角色整页加载
+    "navigation": "hash",
+    "workers": 2,  # 并行浏览器数量，每个约占用 300MB 内存
+    # 每个浏览器内同时打开的标签页数，内存有限时可用 workers=1 + 多标签页代替多个浏览器
+    "tabs": 1,
+    # 预加载：tabs 为 1 时额外打开一个标签页，提取当前角色的同时加载下一个角色
+    "prefetch": False,
+    "journal_keep": 10,  # 保留最近几次运行的抓取日志
+    # http: 直接请求 armory API，失败再回退浏览器；async: asyncio 并发请求（需 aiohttp）；
+    # inpage: 在已登录页面内批量 fetch；browser: 仅用浏览器。可用 --backend 参数覆盖
+    "backend": "http",
+}
+
+# Armory API（无浏览器）抓取配置
+API_CONFIG = {
+    "endpoint": "/do",
+    "timeout": 10,
+    "workers": 8,  # 并发请求线程数
+    "pool_size": 8,  # 连接池大小
+    "proxy": None,  # 例如 "http://127.0.0.1:7890"
+    "fallback_to_browser": True,  # API 无数据时回退到浏览器抓取
+    # async 模式
+    "async_concurrency": 16,  # 同时在途的请求数上限
+    "rate_per_host": 5,  # 每个 host 每秒请求数（令牌桶）
+    "rate_burst": 10,  # 令牌桶容量
+    # inpage 模式：在已登录页面内用 fetch 批量请求
+    "inpage_batch_size": 50,  # 每次 execute_async_script 请求的角色数
+    "inpage_concurrency": 6,  # 页面内同时在途的 fetch 数
+    "inpage_script_timeout": 120,  # 单批脚本超时（秒）
 }
 
 # 文件路径配置
 FILE_PATHS = {
     "character_info": "data/character_info.xlsx",
     "result": "data/result.xlsx",
-    "log_file": "logs/process_record.txt"
+    "log_file": "logs/process_record.txt",
+    "crawl_cache": "data/crawl_cache.json",
+    "journal_dir": "data/journal",  # 每次运行的逐角色抓取日志，用于 --resume
+    "browser_daemon_dir": "data/browser_daemon",  # 常驻浏览器服务的状态文件与租约
+    "binary_manifest": "data/binary_manifest.json",  # chromedriver / Chrome 路径与版本缓存
+    "run_stream": "data/run_records.jsonl",  # 本次运行的逐条记录流，抓取时追加，报告阶段读回
+}
+
+# 常驻浏览器服务（browser_daemon.py），爬虫启动时自动连接其中空闲的实例
+DAEMON_CONFIG = {
+    "attach": True,  # 有可用的常驻实例时连接它，而不是每次冷启动 Chrome
+    "instances": 2,
+    "base_port": 9300,
+    "health_interval": 30,  # 健康检查间隔（秒）
+    "health_timeout": 5,
+    "max_failures": 3,  # 连续这么多次健康检查失败后重启实例
+    "max_rss_mb": 1500,  # 实例空闲时内存超过该值则重启
+}
+
+# 各入口模块的导入耗时预算（毫秒），由 python -m utils.startup_benchmark 检查
+STARTUP_BUDGET_MS = {
+    "mplus_batch_crawler": 700,  # 实测 400~540ms（取 3 次最快），主要是 pandas（读取角色表需要）
+    "generate_report": 150,  # 报告依赖在确认数据文件存在后才导入
+    "excel_editor_app": 400,  # flask；pandas 在首次请求时导入
+}
+
+# 增量抓取缓存配置
+CACHE_CONFIG = {
+    "enabled": True,
+    "idle_after_days": 7,  # 数据超过这么多天没有变化视为不活跃
+    "ttl_hours": 72,  # 不活跃角色在这段时间内直接复用缓存，不重新抓取
 }
 
 # WCL URL配置（已归档到 legacy/）
@@ -217,7 +306,10 @@ SERVER_SLUG_MAP = {
 # Cookie/Session 持久化配置
 SESSION_CONFIG = {
     "user_data_dir": "chrome_profile",  # Chrome 用户数据目录
-    "first_run_message": "首次使用需要登录战网。请在有显示器的电脑上运行 login_helper.py"
+    "first_run_message": "首次使用需要登录战网。请在有显示器的电脑上运行 login_helper.py",
+    # 最近这段时间内确认过登录态且 Cookie 未临近过期时，跳过浏览器登录检查
+    "login_cache_minutes": 360,
+    "cookie_expiry_margin_minutes": 10,
 }
 
 # HTML报告文件管理配置
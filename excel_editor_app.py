@@ -1,4 +1,3 @@
-import pandas as pd
 from flask import Flask, render_template, request, redirect, url_for
 import hashlib
 from config.settings import CLASS_COLOR_MAP # 导入职业颜色映射
@@ -24,6 +23,8 @@ app.jinja_env.filters['string_to_color_hsl_alpha'] = string_to_hsl_color
 
 @app.route('/')
 def index():
+    import pandas as pd  # 首次请求时才加载，服务启动更快
+
     try:
         df = pd.read_excel(EXCEL_FILE)
         # Fill NaN values with empty strings to ensure all cells are displayed
@@ -45,6 +46,8 @@ def index():
 
 @app.route('/save_all', methods=['POST'])
 def save_all():
+    import pandas as pd
+
     try:
         # 获取请求中的密码
         provided_password = request.headers.get('X-Password') # 假设密码通过X-Password头传递
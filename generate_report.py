@@ -9,7 +9,6 @@ Mythic+ 性能追踪报告生成器
 import os
 import sys
 from datetime import datetime
-from utils.html_visualizer import HTMLVisualizer
 from utils.report_manager import ReportManager
 from utils.logger import logger
 
@@ -36,6 +35,9 @@ def generate_html_report():
         return False
 
     try:
+        # pandas / openpyxl 等依赖较重，确认输入文件存在后再导入
+        from utils.html_visualizer import HTMLVisualizer
+
         # 创建HTML可视化器
         visualizer = HTMLVisualizer()
 
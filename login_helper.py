@@ -1,7 +1,7 @@
 """
 首次登录引导脚本 - 跨平台（Windows/Linux/macOS）
 
-在有显示器的电脑上运行一次，手动登录战网获取 Cookie（cookies.pkl）。
+在有显示器的电脑上运行一次，手动登录战网获取 Cookie（cookies.json）。
 之后 NAS 上的爬虫即可复用此 Cookie 登录态，无需转移整个 Chrome 配置目录。
 
 用法:
@@ -12,18 +12,18 @@
   2. 手动完成登录（输入账号密码/扫码）
   3. 登录成功后页面跳转到角色页面
   4. 回到终端，按 Enter 确认
-  5. Cookie 自动提取保存到 chrome_profile/cookies.pkl
+  5. Cookie 自动提取保存到 chrome_profile/cookies.json（同时记录登录确认时间）
   6. 把 cookie 文件传到 NAS 上即可
 """
 
 import sys
 import os
 import time
-import pickle
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from utils.browser_manager import BrowserManager
+from utils.cookie_store import CookieStore
 
 
 def main():
@@ -92,14 +92,15 @@ def main():
             os.path.dirname(os.path.abspath(__file__)), "chrome_profile"
         )
         os.makedirs(save_dir, exist_ok=True)
-        cookie_file = os.path.join(save_dir, "cookies.pkl")
-        with open(cookie_file, "wb") as f:
-            pickle.dump(blz_cookies if blz_cookies else all_cookies, f)
+        cookie_file = CookieStore(save_dir).save(
+            blz_cookies if blz_cookies else all_cookies,
+            authenticated=bool(blz_cookies),
+        )
 
         print(f"\n  ✅ Cookie 已保存到: {cookie_file}")
 
         if blz_cookies:
-            print("  ✅ 登录成功！现在可以把这个 cookies.pkl 文件")
+            print("  ✅ 登录成功！现在可以把这个 cookies.json 文件")
             print("     传到 NAS 上的 chrome_profile/ 目录，然后运行爬虫。")
         else:
             print("  ⚠️  未找到 Blizzard 相关 Cookie，可能登录未成功。")
@@ -1,140 +1,194 @@
 import time
 import sys
+import argparse
+import importlib.util
 import os
 import json
-import pickle
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config.settings import (
     FILE_PATHS, CRAWLER_CONFIG, SERVER_SLUG_MAP,
-    SESSION_CONFIG
+    SESSION_CONFIG, BROWSER_CONFIG, API_CONFIG, BLIZZARD_API_BASE,
+    BLIZZARD_BASE_URL, CACHE_CONFIG, DAEMON_CONFIG
 )
 from utils.logger import logger
 from utils.data_processor import DataProcessor
-from utils.report_generator import ReportGenerator
 from utils.browser_manager import BrowserManager
-from utils.html_visualizer import HTMLVisualizer
+from utils.browser_daemon import BrowserDaemon
+from utils.page_timing import PageLoadTracker, PageTransferStats
+from utils.crawl_cache import CrawlCache
+from utils.crawl_journal import CrawlJournal
+from utils.retry_queue import RetryQueue
+from utils.run_stream import RunSink
+
+
+CrawlJob = namedtuple("CrawlJob", ["index", "player", "name", "server"])
 
 
 class MythicPlusCrawler:
-    def __init__(self):
+    def __init__(self, backend=None, tabs=None, prefetch=False, driver=None):
         self.data_processor = DataProcessor()
-        self.report_generator = ReportGenerator()
         self.browser_manager = BrowserManager()
-        self.config = CRAWLER_CONFIG
-        self.cookie_file = os.path.join(
-            os.getcwd(),
-            SESSION_CONFIG.get("user_data_dir", "chrome_profile"),
-            "cookies.pkl"
-        )
+        if driver:
+            self.browser_manager.config = dict(self.browser_manager.config, driver_backend=driver)
+        self.config = dict(CRAWLER_CONFIG)
+        if backend:
+            self.config["backend"] = backend
+        if tabs:
+            self.config["tabs"] = tabs
+        if prefetch:
+            self.config["prefetch"] = True
+        self.page_timer = PageLoadTracker(self.config)
+        self.transfer_stats = PageTransferStats()
+        self.journal = None
+        self.cache = None
+        self.sink = None
+        self._cache_changed = 0
+        self._emit_lock = threading.Lock()
 
     def _ensure_login(self, driver):
         logger.info("检查登录状态...")
         try:
+            # 先在首次导航前写入 Cookie，只需加载一次页面即可确认登录态
+            injected = self.browser_manager.inject_cookies(driver)
+            if injected and self.browser_manager.is_session_fresh():
+                logger.success("登录态近期已确认且 Cookie 未过期，跳过在线检查")
+                return True
             driver.get("https://wow.blizzard.cn/character/")
-            time.sleep(5)
-            current = driver.current_url.lower()
-            if "login" in current:
-                logger.info("尝试注入 Cookie 恢复登录态...")
-                injected = self.browser_manager.inject_cookies(driver)
+            self.browser_manager.wait_for_login_state(driver)
+            if "login" in driver.current_url.lower():
                 if injected:
-                    driver.get("https://wow.blizzard.cn/character/")
-                    time.sleep(5)
-                    if "login" not in driver.current_url.lower():
-                        self._save_cookies(driver)
-                        logger.success("Cookie 注入成功，已恢复登录态")
-                        return True
-
+                    logger.warning("已注入 Cookie 但仍跳转到登录页，Cookie 可能已失效")
                 logger.warning(
                     "需要登录战网才能爬取。\n"
                     "请在有显示器的电脑上运行:\n"
                     "  python login_helper.py\n"
-                    "登录完成后，把生成的 chrome_profile/cookies.pkl 拷贝到本机同目录。"
+                    "登录完成后，把生成的 chrome_profile/cookies.json 拷贝到本机同目录。"
                 )
                 return False
             logger.success("已检测到登录态")
-            self._save_cookies(driver)
+            self._save_cookies(driver, authenticated=True)
             return True
         except Exception as e:
             logger.error(f"检查登录态失败: {e}")
             return False
 
-    def _save_cookies(self, driver):
+    def _save_cookies(self, driver, authenticated=False):
         try:
             cookies = driver.get_cookies()
-            os.makedirs(os.path.dirname(self.cookie_file), exist_ok=True)
-            with open(self.cookie_file, "wb") as f:
-                pickle.dump(cookies, f)
-            logger.info(f"已保存 {len(cookies)} 个 Cookie 到 {self.cookie_file}")
+            cookie_file = self.browser_manager.save_cookies(cookies, authenticated=authenticated)
+            logger.info(f"已保存 {len(cookies)} 个 Cookie 到 {cookie_file}")
         except Exception as e:
             logger.debug(f"保存 Cookie 失败: {e}")
 
-    def scrape_character(self, driver, server_name, character_name):
+    def scrape_character(self, driver, server_name, character_name, attempt=1):
+        """抓取单个角色一次。返回记录列表（[] 表示确认无大秘境记录，不必重试），
+        返回 None 表示可重试的失败，由调用方放入重试队列"""
         url = self.data_processor.build_character_url(server_name, character_name)
-        max_attempts = self.config.get("max_attempts", 3)
-        wait_time = self.config.get("wait_time", 8)
-
-        for attempt in range(1, max_attempts + 1):
-            logger.info(f"正在加载角色页面 (第 {attempt} 次): {url}")
-            try:
+        logger.info(f"正在加载角色页面 (第 {attempt} 次): {url}")
+        try:
+            budget = self.page_timer.budget()
+            if BROWSER_CONFIG.get("capture_network"):
+                # 上一个页面剩余的事件，只计入传输统计
+                tail_events = self.browser_manager.read_network_events(driver)
+                self.transfer_stats.add(self.browser_manager.summarize_transfer(tail_events))
+            navigation = self.config.get("navigation", "reload") if attempt == 1 else "reload"
+            character = (self.data_processor.get_server_slug(server_name), character_name)
+            started = time.time()
+            mode = self._navigate(driver, url, navigation)
+            marker, network_records = self._wait_for_page(driver, budget, character)
+            if marker is None and mode == "hash":
+                logger.info("hash 导航后页面未刷新出新角色数据，改为整页加载")
                 driver.get(url)
-                time.sleep(wait_time)
-
-                self.browser_manager.stop_page_loading(driver)
-
-                all_records = []
-
-                records = self.data_processor.extract_mplus_from_dom(driver)
+                marker, network_records = self._wait_for_page(driver, budget, character)
+            self.page_timer.record(time.time() - started, ready=marker is not None)
+            return self._extract_page(driver, marker, network_records, budget, attempt)
+        except Exception as e:
+            logger.error(f"第 {attempt} 次加载页面失败: {e}")
+
+        return None
+
+    def _extract_page(self, driver, marker, network_records, budget, attempt):
+        """从已等待过的角色页面提取记录，返回值含义同 scrape_character"""
+        self.browser_manager.stop_page_loading(driver)
+
+        if network_records:
+            logger.info(f"从网络响应提取到 {len(network_records)} 条大秘境记录")
+            self._save_cookies(driver, authenticated=True)
+            return network_records
+        if marker == "empty":
+            logger.info(f"角色页面存在但无大秘境记录 (0层)，跳过重试")
+            return []
+        if marker is None:
+            logger.info(f"页面在 {budget:.1f}s 内未就绪，尝试直接提取")
+
+        strategy, all_records = self.data_processor.extract_mplus_combined(driver)
+        if all_records:
+            logger.info(f"通过 {strategy} 策略提取到 {len(all_records)} 条大秘境记录")
+            self._save_cookies(driver, authenticated=True)
+            return all_records
+
+        title = driver.title
+        if " - 角色" in title:
+            logger.info(f"角色页面存在但无大秘境记录 (0层)，跳过重试")
+            return []
+
+        if attempt == 1:
+            page_source = driver.page_source[:3000]
+            logger.info(f"页面源码片段: {page_source}")
+
+        return None
+
+    def _navigate(self, driver, url, navigation):
+        if navigation == "hash":
+            return self.browser_manager.navigate_hash(
+                driver, url, before_script=self.data_processor.MARK_STALE_JS
+            )
+        driver.get(url)
+        return "reload"
+
+    def _wait_for_page(self, driver, timeout, character, poll=0.2):
+        """等待角色页面就绪，返回 (marker, records)。
+        启用网络捕获时 character=(realm_slug, 角色名) 的 armory API 响应一到达就直接解析返回，
+        不再等待页面渲染"""
+        if not BROWSER_CONFIG.get("capture_network"):
+            return self.data_processor.wait_for_mytable_data(driver, timeout=timeout), []
+
+        deadline = time.time() + timeout
+        pending = {}
+        page_events = []
+        is_current_character = lambda url: self.data_processor.api_url_matches(url, *character)
+        try:
+            while True:
+                events = self.browser_manager.read_network_events(driver)
+                page_events.extend(events)
+                payloads = self.browser_manager.collect_json_responses(
+                    driver, events, BLIZZARD_API_BASE, pending, is_current_character
+                )
+                records = self.data_processor.extract_mplus_from_network(payloads)
                 if records:
-                    all_records.extend(records)
+                    return "network", records
+                try:
+                    marker = driver.execute_script(self.data_processor.MPLUS_READY_JS)
+                except Exception:
+                    marker = None
+                if marker:
+                    return marker, []
+                if time.time() >= deadline:
+                    return None, []
+                time.sleep(poll)
+        finally:
+            page_summary = self.browser_manager.summarize_transfer(page_events)
+            self.transfer_stats.add(page_summary, new_page=True)
+            logger.debug(
+                f"本页传输 {page_summary['bytes'] / 1024:.0f}KB "
+                f"({page_summary['requests']} 个请求), 拦截 {page_summary['blocked']} 个请求"
+            )
 
-                if not all_records:
-                    records = self.data_processor.extract_mplus_from_page_text(driver)
-                    if records:
-                        logger.info(f"从页面文本提取到 {len(records)} 条大秘境记录")
-                        all_records.extend(records)
-
-                if not all_records:
-                    vue_records = self.data_processor.extract_window_data_vue(driver)
-                    if vue_records:
-                        logger.info(f"从 Vue data 提取到 {len(vue_records)} 条记录")
-                        all_records.extend(vue_records)
-
-                if not all_records:
-                    attr_records = self.data_processor.extract_json_from_attrs(driver)
-                    if attr_records:
-                        logger.info(f"从 DOM 属性提取到 {len(attr_records)} 条记录")
-                        all_records.extend(attr_records)
-
-                if not all_records:
-                    vuex_records = self.data_processor.extract_vuex_data(driver)
-                    if vuex_records:
-                        logger.info(f"从 Vuex store 提取到 {len(vuex_records)} 条记录")
-                        all_records.extend(vuex_records)
-
-                if all_records:
-                    self._save_cookies(driver)
-                    return all_records
-
-                title = driver.title
-                if " - 角色" in title:
-                    logger.info(f"角色页面存在但无大秘境记录 (0层)，跳过重试")
-                    return []
-
-                if attempt == 1:
-                    page_source = driver.page_source[:3000]
-                    logger.info(f"页面源码片段: {page_source}")
-
-            except Exception as e:
-                logger.error(f"第 {attempt} 次加载页面失败: {e}")
-
-            if attempt < max_attempts:
-                time.sleep(3)
-
-        logger.warning(f"未能提取到数据: {character_name}")
-        return []
-
-    def run_crawler(self):
+    def run_crawler(self, resume=None):
         logger.info("=== 开始执行神话副本爬虫 (Blizzard 国服) ===")
 
         char_df = self.data_processor.load_character_data(FILE_PATHS["character_info"])
@@ -146,59 +200,639 @@ class MythicPlusCrawler:
             logger.error("角色数据验证失败，程序终止")
             return False
 
-        all_records = []
-        driver = None
+        jobs = self._build_jobs(char_df)
+        self.journal = self._open_journal(resume)
+        jobs_left, resumed_results = self._apply_journal(jobs, self.journal)
+
+        self.cache = CrawlCache() if CACHE_CONFIG.get("enabled") else None
+        crawl_jobs, cached_results = self._plan_jobs(jobs_left, self.cache)
+
+        # 每个角色的结果一到就写入记录流并更新汇总，不在内存中累积全部记录；
+        # 续跑和缓存命中的角色不需要抓取，先写入
+        self.sink = RunSink()
+        for job in jobs:
+            if job.index in resumed_results:
+                self._emit(job, resumed_results.pop(job.index))
+            elif job.index in cached_results:
+                self._emit(job, cached_results.pop(job.index), cached=True)
+
+        results = self._crawl(crawl_jobs)
+        if results is None:
+            self.sink.close()
+            return False
+        self.journal.mark_complete()
+        self.journal.prune(self.config.get("journal_keep", 10))
+        if self.cache:
+            self._save_cache()
+
+        logger.info(self.sink.aggregates.summary())
+        if not self.sink.aggregates.runs:
+            self.sink.close()
+            logger.error("没有任何副本数据被抓取，终止。")
+            return False
+
+        return self._generate_report(self.sink, char_df)
+
+    def _build_jobs(self, char_df):
+        jobs = []
+        for index, (_, row) in enumerate(char_df.iterrows()):
+            jobs.append(CrawlJob(
+                index=index,
+                player=str(row["玩家"]).strip(),
+                name=str(row["角色名"]).strip(),
+                server=str(row["服务器"]).strip(),
+            ))
+        return jobs
+
+    def _open_journal(self, resume):
+        """resume 为 None 时开始新的运行；为 'latest' 时续跑最近一次未完成的运行；否则按 run id 续跑"""
+        run_id = None
+        if resume == "latest":
+            run_id = CrawlJournal.latest_unfinished()
+            if not run_id:
+                logger.info("没有找到未完成的运行，开始新的运行")
+        elif resume:
+            run_id = resume
+        journal = CrawlJournal(run_id)
+        logger.info(f"本次运行 id: {journal.run_id}（抓取日志: {journal.path}）")
+        return journal
+
+    def _apply_journal(self, jobs, journal):
+        completed = journal.load_completed()
+        if not completed:
+            return jobs, {}
+        jobs_left, resumed_results = [], {}
+        for job in jobs:
+            key = journal.key(job.server, job.name)
+            if key in completed:
+                resumed_results[job.index] = [dict(record) for record in completed[key]]
+            else:
+                jobs_left.append(job)
+        logger.info(f"续跑: {len(resumed_results)} 个角色已在本次运行中完成，剩余 {len(jobs_left)} 个")
+        return jobs_left, resumed_results
+
+    @staticmethod
+    def _run_fields(records):
+        return [
+            {k: v for k, v in record.items() if k not in ("玩家", "角色名", "服务器")}
+            for record in records
+        ]
+
+    def _record_result(self, results, job, records):
+        """记录单个角色结果：results 中只保留记录条数（None 表示失败），
+        记录本身追加到抓取日志并交给下游记录流"""
+        results[job.index] = None if records is None else len(records)
+        if records is None:
+            return
+        if self.journal is not None:
+            try:
+                self.journal.append(job.server, job.name, self._run_fields(records))
+            except OSError as e:
+                logger.warning(f"写入抓取日志失败: {e}")
+        self._emit(job, records)
+
+    def _emit(self, job, records, cached=False):
+        """写入记录流并更新汇总；不是来自缓存的结果同时更新抓取缓存"""
+        if self.sink is not None:
+            self.sink.append(job, records)
+        if self.cache is not None and not cached:
+            if self.cache.update(job.server, job.name, self._run_fields(records)):
+                with self._emit_lock:
+                    self._cache_changed += 1
+
+    def _plan_jobs(self, jobs, cache):
+        """根据缓存决定抓取哪些角色：不活跃且缓存未过期的直接复用，
+        其余角色中活跃的排在前面，不活跃的排在最后"""
+        if cache is None:
+            return jobs, {}
+
+        now = time.time()
+        active, idle, cached_results = [], [], {}
+        for job in jobs:
+            if cache.is_fresh(job.server, job.name, now):
+                cached_results[job.index] = cache.cached_records(job.server, job.name)
+            elif cache.is_idle(job.server, job.name, now):
+                idle.append(job)
+            else:
+                active.append(job)
 
+        if cached_results:
+            logger.info(f"{len(cached_results)} 个角色长期无变化，复用缓存数据")
+        return active + idle, cached_results
+
+    def _save_cache(self):
+        try:
+            self.cache.save()
+            logger.info(f"抓取缓存已更新，{self._cache_changed} 个角色数据有变化")
+        except OSError as e:
+            logger.warning(f"保存抓取缓存失败: {e}")
+
+    def _crawl(self, jobs):
+        if not jobs:
+            return {}
+        backend = self.config.get("backend", "browser")
+        results = {}
+        pending = jobs
+
+        if backend == "async" and importlib.util.find_spec("aiohttp") is None:
+            logger.warning("未安装 aiohttp，async 模式改用 http 模式")
+            backend = "http"
+
+        api_backends = {
+            "http": self._crawl_with_http,
+            "async": self._crawl_with_async,
+            "inpage": self._crawl_in_page,
+        }
+        if backend in api_backends:
+            results = api_backends[backend](jobs)
+            pending = [job for job in jobs if results.get(job.index) is None]
+            if pending and not API_CONFIG.get("fallback_to_browser", True):
+                logger.warning(f"{len(pending)} 个角色 API 无数据，未启用浏览器回退")
+                pending = []
+            elif pending:
+                logger.info(f"{len(pending)} 个角色 API 无数据，回退到浏览器抓取")
+
+        if pending:
+            browser_results = self._crawl_with_browser_pool(pending)
+            if browser_results is None:
+                return results if any(results.values()) else None
+            results.update(browser_results)
+        return results
+
+    def _crawl_with_http(self, jobs):
+        logger.info(f"使用 API 直接抓取 {len(jobs)} 个角色")
+        from utils.armory_client import ArmoryHttpClient
+
+        client = ArmoryHttpClient(self.browser_manager)
+        if not client.cookie_count:
+            logger.warning("未加载到 Cookie，API 请求可能因未登录而失败")
+
+        results = {}
+        started = time.time()
         try:
-            driver = self.browser_manager.create_driver(use_persistent_session=False)
+            with ThreadPoolExecutor(max_workers=int(API_CONFIG.get("workers", 8))) as pool:
+                futures = {
+                    pool.submit(client.fetch_character, job.server, job.name): job
+                    for job in jobs
+                }
+                for future in as_completed(futures):
+                    job = futures[future]
+                    records = future.result()
+                    self._record_result(results, job, records)
+                    if records:
+                        logger.info(f"[API] {job.player} / {job.name}（{job.server}）: {len(records)} 条记录")
+        finally:
+            client.close()
+
+        succeeded = sum(1 for records in results.values() if records)
+        logger.info(f"API 抓取完成: {succeeded}/{len(jobs)} 个角色有数据, 耗时 {time.time() - started:.1f}s")
+        return results
 
+    def _crawl_with_async(self, jobs):
+        import asyncio
+        from utils.async_crawler import AsyncArmoryCrawler
+
+        crawler = AsyncArmoryCrawler(self.browser_manager)
+        logger.info(
+            f"使用 asyncio 抓取 {len(jobs)} 个角色 "
+            f"(并发 {crawler.concurrency}, 每 host {crawler.rate:g} 请求/秒)"
+        )
+        if not crawler.cookies:
+            logger.warning("未加载到 Cookie，API 请求可能因未登录而失败")
+
+        started = time.time()
+        results = {}
+        asyncio.run(crawler.crawl(
+            jobs, on_result=lambda job, records: self._record_result(results, job, records)
+        ))
+        succeeded = sum(1 for records in results.values() if records)
+        logger.info(f"async 抓取完成: {succeeded}/{len(jobs)} 个角色有数据, 耗时 {time.time() - started:.1f}s")
+        return results
+
+    def _create_driver(self, debug_port=None):
+        """优先连接常驻浏览器服务中空闲的实例，没有则自行启动浏览器。
+        返回 (driver, 占用的常驻实例端口或 None)"""
+        if DAEMON_CONFIG.get("attach", True):
+            port = BrowserDaemon.acquire()
+            if port is not None:
+                try:
+                    driver = self.browser_manager.create_driver(
+                        use_persistent_session=False, debugger_address=f"127.0.0.1:{port}"
+                    )
+                    return driver, port
+                except Exception as e:
+                    logger.warning(f"连接常驻浏览器 {port} 失败，改为启动新浏览器: {e}")
+                    BrowserDaemon.release(port)
+        driver = self.browser_manager.create_driver(
+            use_persistent_session=False, debug_port=debug_port
+        )
+        return driver, None
+
+    def _respawn_driver(self, driver, leased_port, debug_port=None):
+        """浏览器卡死后重建，返回 (driver, 占用的常驻实例端口或 None)。
+        常驻实例的 Chrome 不归本进程管理，杀不掉也不该重连：通知服务端重启它，
+        释放租约后改为自行启动浏览器"""
+        if leased_port is None:
+            return self.browser_manager.respawn_driver(driver), None
+        logger.warning(f"常驻浏览器 {leased_port} 无响应，交由服务端重启，改为启动本地浏览器")
+        BrowserDaemon.mark_unhealthy(leased_port)
+        BrowserDaemon.release(leased_port)
+        self.browser_manager.kill_driver_processes(driver)
+        self.browser_manager.safe_quit(driver)
+        new_driver = self.browser_manager.create_driver(
+            use_persistent_session=False, debug_port=debug_port
+        )
+        self.browser_manager.inject_cookies(new_driver)
+        return new_driver, None
+
+    def _crawl_in_page(self, jobs):
+        batch_size = max(1, int(API_CONFIG.get("inpage_batch_size", 50)))
+        concurrency = int(API_CONFIG.get("inpage_concurrency", 6))
+        logger.info(f"使用页面内批量请求抓取 {len(jobs)} 个角色 (每批 {batch_size}, 并发 {concurrency})")
+
+        results = {}
+        driver = None
+        leased_port = None
+        started = time.time()
+        try:
+            driver, leased_port = self._create_driver()
             if not self._ensure_login(driver):
-                return False
+                return results
+            if not driver.current_url.startswith(BLIZZARD_BASE_URL):
+                # 跳过在线登录检查时页面还是空白页，fetch 需要在 wow.blizzard.cn 域下发起
+                driver.get(BLIZZARD_BASE_URL)
+            driver.set_script_timeout(API_CONFIG.get("inpage_script_timeout", 120))
+
+            for offset in range(0, len(jobs), batch_size):
+                batch = jobs[offset:offset + batch_size]
+                pairs = [(self.data_processor.get_server_slug(job.server), job.name) for job in batch]
+                batch_results = self.data_processor.extract_mplus_batch(
+                    driver, pairs, concurrency, API_CONFIG.get("endpoint", "/do")
+                )
+                for job, records in zip(batch, batch_results):
+                    self._record_result(results, job, records)
+                    if records:
+                        logger.info(f"[inpage] {job.player} / {job.name}（{job.server}）: {len(records)} 条记录")
 
-            for _, row in char_df.iterrows():
-                player = str(row["玩家"]).strip()
-                name = str(row["角色名"]).strip()
-                server = str(row["服务器"]).strip()
+            self._save_cookies(driver)
+        except Exception as e:
+            logger.error(f"页面内批量抓取出错: {e}")
+        finally:
+            if driver:
+                self.browser_manager.safe_quit(driver)
+            if leased_port is not None:
+                BrowserDaemon.release(leased_port)
+
+        succeeded = sum(1 for records in results.values() if records)
+        logger.info(f"页面内抓取完成: {succeeded}/{len(jobs)} 个角色有数据, 耗时 {time.time() - started:.1f}s")
+        return results
+
+    def _crawl_with_browser_pool(self, jobs):
+        worker_count = max(1, min(int(self.config.get("workers", 1)), len(jobs)))
+        logger.info(f"启动 {worker_count} 个浏览器 worker，共 {len(jobs)} 个角色")
+
+        job_queue = RetryQueue(
+            jobs,
+            max_attempts=self.config.get("max_attempts", 3),
+            base_delay=self.config.get("retry_base_delay", 3),
+            max_delay=self.config.get("retry_max_delay", 60),
+        )
 
-                logger.info(f"\n—— 开始抓取：{player} / {name}（{server}）")
+        tab_count = self._tab_count()
+        worker = self._crawl_tab_worker if tab_count > 1 else self._crawl_worker
+        if self.config.get("prefetch") and int(self.config.get("tabs", 1)) <= 1:
+            logger.info("预加载模式：提取当前角色时另一个标签页已在加载下一个角色")
+        elif tab_count > 1:
+            logger.info(f"每个浏览器打开 {tab_count} 个标签页轮转抓取")
+
+        results = {}
+        stats = []
+        threads = []
+        for worker_id in range(worker_count):
+            thread = threading.Thread(
+                target=worker,
+                args=(worker_id, job_queue, results, stats),
+                name=f"crawl-worker-{worker_id}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+
+        self._log_worker_summary(stats)
+        logger.info(self.page_timer.summary())
+        logger.info(self.transfer_stats.summary())
+
+        if not any(stat["logged_in"] for stat in stats):
+            return None
+        if job_queue.remaining():
+            logger.warning(f"仍有 {job_queue.remaining()} 个角色未被处理")
+        return results
+
+    def _tab_count(self):
+        tabs = max(1, int(self.config.get("tabs", 1)))
+        if self.config.get("prefetch") and tabs == 1:
+            # 一个标签页提取数据时，另一个标签页预加载下一个角色
+            return 2
+        return tabs
+
+    @staticmethod
+    def _new_worker_stat(worker_id):
+        return {
+            "worker": worker_id,
+            "logged_in": False,
+            "characters": 0,
+            "records": 0,
+            "failed": 0,
+            "respawns": 0,
+            "recycles": 0,
+            "elapsed": 0.0,
+        }
+
+    def _report_job(self, job, attempt, char_data, retry_delay, results, stat):
+        """记录一个角色的抓取结果并更新 worker 统计"""
+        if char_data is None:
+            if retry_delay is not None:
+                logger.info(f"{job.name} 抓取失败，{retry_delay:.1f}s 后重试")
+                return
+            logger.warning(f"未能提取到数据: {job.name}（已尝试 {attempt} 次）")
+            stat["failed"] += 1
+            return
+
+        if char_data:
+            logger.info(f"获取成功，共 {len(char_data)} 条记录")
+        else:
+            logger.info(f"角色无大秘境记录: {job.name}")
 
-                char_data = self.scrape_character(driver, server, name)
-                if char_data:
-                    logger.info(f"获取成功，共 {len(char_data)} 条记录")
-                else:
-                    logger.warning(f"未获取到数据: {name}")
+        self._record_result(results, job, char_data)
+        stat["characters"] += 1
+        stat["records"] += len(char_data)
 
-                for entry in char_data:
-                    entry.update({
-                        "玩家": player,
-                        "角色名": name,
-                        "服务器": server,
-                    })
-                    all_records.append(entry)
+    def _crawl_worker(self, worker_id, job_queue, results, stats):
+        stat = self._new_worker_stat(worker_id)
+        pages = 0
+        deadline = BROWSER_CONFIG.get("character_deadline", 90)
+        started = time.time()
+        driver = None
+        leased_port = None
+
+        try:
+            base_port = BROWSER_CONFIG.get("remote_debugging_port", 9222)
+            driver, leased_port = self._create_driver(debug_port=base_port + worker_id)
+
+            if not self._ensure_login(driver):
+                return
+            stat["logged_in"] = True
+
+            while True:
+                task = job_queue.get()
+                if task is None:
+                    break
+                job, attempt = task
+
+                logger.info(f"\n—— [worker {worker_id}] 开始抓取：{job.player} / {job.name}（{job.server}）")
+
+                char_data = None
+                fired = None
+                try:
+                    with self.browser_manager.watchdog(
+                        driver, deadline, f"[worker {worker_id}] {job.name}"
+                    ) as fired:
+                        char_data = self.scrape_character(driver, job.server, job.name, attempt)
+                    if fired.is_set():
+                        char_data = None
+                finally:
+                    retry_delay = job_queue.task_done(job, attempt, failed=char_data is None)
+                # 先落盘结果，回收/重建浏览器失败时已抓到的记录也不会丢
+                self._report_job(job, attempt, char_data, retry_delay, results, stat)
+
+                pages += 1
+                if fired is not None and fired.is_set():
+                    logger.warning(f"[worker {worker_id}] 浏览器卡死，重建浏览器")
+                    stat["respawns"] += 1
+                    driver, leased_port = self._respawn_driver(driver, leased_port, base_port + worker_id)
+                    pages = 0
+                    if not self._ensure_login(driver):
+                        break
+                else:
+                    reason = self.browser_manager.should_recycle(driver, pages)
+                    if reason:
+                        logger.info(f"[worker {worker_id}] {reason}，回收浏览器")
+                        stat["recycles"] += 1
+                        driver = self.browser_manager.recycle_driver(driver)
+                        pages = 0
 
             self._save_cookies(driver)
 
         except Exception as e:
-            logger.error(f"爬取过程出错: {e}")
+            logger.error(f"[worker {worker_id}] 爬取过程出错: {e}")
             import traceback
             logger.debug(traceback.format_exc())
         finally:
             if driver:
                 self.browser_manager.safe_quit(driver)
+            if leased_port is not None:
+                BrowserDaemon.release(leased_port)
+            stat["elapsed"] = time.time() - started
+            stats.append(stat)
+
+    def _crawl_tab_worker(self, worker_id, job_queue, results, stats):
+        """一个浏览器内多个标签页轮转抓取：空闲标签页领取角色并发起跳转（不等待），
+        再依次轮询各标签页，哪个先就绪就先提取哪个"""
+        stat = self._new_worker_stat(worker_id)
+        tab_count = self._tab_count()
+        deadline = BROWSER_CONFIG.get("character_deadline", 90)
+        capture_network = BROWSER_CONFIG.get("capture_network")
+        pages = 0
+        recycle_reason = None
+        started = time.time()
+        driver = None
+        leased_port = None
 
-        if not all_records:
-            logger.error("没有任何副本数据被抓取，终止。")
-            return False
+        try:
+            base_port = BROWSER_CONFIG.get("remote_debugging_port", 9222)
+            driver, leased_port = self._create_driver(debug_port=base_port + worker_id)
 
-        return self._generate_report(all_records, char_df)
+            if not self._ensure_login(driver):
+                return
+            stat["logged_in"] = True
+            tabs = [{"handle": handle, "task": None}
+                    for handle in self.browser_manager.open_tabs(driver, tab_count)]
+
+            while not job_queue.finished():
+                progressed = False
+                broken = False
+                with self.browser_manager.watchdog(
+                    driver, deadline, f"[worker {worker_id}] 标签页轮询"
+                ) as fired:
+                    try:
+                        if capture_network:
+                            # 日志里各标签页的事件按 webview（即 window handle）分给对应的标签页
+                            events = self.browser_manager.read_network_events(driver)
+                            self.transfer_stats.add(self.browser_manager.summarize_transfer(events))
+                            for tab in tabs:
+                                if tab["task"] is not None:
+                                    tab["events"].extend(
+                                        event for event in events if event.get("webview") == tab["handle"]
+                                    )
+                        for tab in tabs:
+                            if tab["task"] is None:
+                                task = None if recycle_reason else job_queue.try_get()
+                                if task is not None:
+                                    self._start_tab(driver, tab, task)
+                                    progressed = True
+                                continue
+                            finished, char_data = self._poll_tab(driver, tab)
+                            if not finished:
+                                continue
+                            progressed = True
+                            job, attempt = tab["task"]
+                            tab["task"] = None
+                            retry_delay = job_queue.task_done(job, attempt, failed=char_data is None)
+                            pages += 1
+                            if capture_network:
+                                self.transfer_stats.add({}, new_page=True)
+                            recycle_reason = recycle_reason or self.browser_manager.should_recycle(driver, pages)
+                            # 先让这个标签页开始加载下一个角色，再处理结果，
+                            # 日志与缓存写入的时间和页面加载重叠；跳转出错时结果照样记录
+                            try:
+                                task = None if recycle_reason else job_queue.try_get()
+                                if task is not None:
+                                    self._start_tab(driver, tab, task)
+                            finally:
+                                self._report_job(job, attempt, char_data, retry_delay, results, stat)
+                    except Exception as e:
+                        logger.error(f"[worker {worker_id}] 标签页轮转出错: {e}")
+                        broken = True
+
+                if fired.is_set() or broken:
+                    logger.warning(f"[worker {worker_id}] 浏览器异常，重建浏览器")
+                    for tab in tabs:
+                        if tab["task"] is not None:
+                            job, attempt = tab["task"]
+                            retry_delay = job_queue.task_done(job, attempt, failed=True)
+                            self._report_job(job, attempt, None, retry_delay, results, stat)
+                            tab["task"] = None
+                    stat["respawns"] += 1
+                    driver, leased_port = self._respawn_driver(driver, leased_port, base_port + worker_id)
+                    pages, recycle_reason = 0, None
+                    if not self._ensure_login(driver):
+                        break
+                    tabs = [{"handle": handle, "task": None}
+                            for handle in self.browser_manager.open_tabs(driver, tab_count)]
+                    continue
+
+                if recycle_reason and all(tab["task"] is None for tab in tabs):
+                    logger.info(f"[worker {worker_id}] {recycle_reason}，回收浏览器")
+                    stat["recycles"] += 1
+                    driver = self.browser_manager.recycle_driver(driver)
+                    pages, recycle_reason = 0, None
+                    tabs = [{"handle": handle, "task": None}
+                            for handle in self.browser_manager.open_tabs(driver, tab_count)]
+                    continue
+
+                if not progressed:
+                    time.sleep(0.2)
 
-    def _generate_report(self, all_records, char_df):
+            self._save_cookies(driver)
+
+        except Exception as e:
+            logger.error(f"[worker {worker_id}] 爬取过程出错: {e}")
+            import traceback
+            logger.debug(traceback.format_exc())
+        finally:
+            if driver:
+                self.browser_manager.safe_quit(driver)
+            if leased_port is not None:
+                BrowserDaemon.release(leased_port)
+            stat["elapsed"] = time.time() - started
+            stats.append(stat)
+
+    def _start_tab(self, driver, tab, task):
+        """切到标签页并发起跳转，不等待页面加载"""
+        job, attempt = task
+        url = self.data_processor.build_character_url(job.server, job.name)
+        logger.info(f"\n—— 标签页开始抓取 (第 {attempt} 次)：{job.player} / {job.name}（{job.server}）")
+        navigation = self.config.get("navigation", "reload") if attempt == 1 else "reload"
+        # 跳转前就把任务挂到标签页上，跳转出错时由重建流程把它报告为失败
+        tab.update(
+            task=task, url=url, character=(self.data_processor.get_server_slug(job.server), job.name),
+            events=[], pending={},
+        )
+        driver.switch_to.window(tab["handle"])
+        budget = self.page_timer.budget()
+        mode = self.browser_manager.start_navigation(
+            driver, url, before_script=self.data_processor.MARK_STALE_JS,
+            reload=navigation != "hash",
+        )
+        now = time.time()
+        tab.update(mode=mode, budget=budget, started=now, ready_by=now + budget)
+
+    def _poll_tab(self, driver, tab):
+        """检查标签页是否就绪，返回 (是否结束, 记录)；记录含义同 scrape_character"""
+        driver.switch_to.window(tab["handle"])
+        network_records = []
+        if tab["events"]:
+            payloads = self.browser_manager.collect_json_responses(
+                driver, tab["events"], BLIZZARD_API_BASE, tab["pending"],
+                lambda url: self.data_processor.api_url_matches(url, *tab["character"]),
+            )
+            tab["events"] = []
+            network_records = self.data_processor.extract_mplus_from_network(payloads)
+        if network_records:
+            marker = "network"
+        else:
+            try:
+                marker = driver.execute_script(self.data_processor.MPLUS_READY_JS)
+            except Exception:
+                marker = None
+        if not marker and time.time() < tab["ready_by"]:
+            return False, None
+        if not marker and tab["mode"] == "hash":
+            logger.info("hash 导航后页面未刷新出新角色数据，改为整页加载")
+            tab["mode"] = self.browser_manager.start_navigation(driver, tab["url"], reload=True)
+            tab["ready_by"] = time.time() + tab["budget"]
+            return False, None
+
+        _, attempt = tab["task"]
+        self.page_timer.record(time.time() - tab["started"], ready=bool(marker))
+        try:
+            return True, self._extract_page(driver, marker or None, network_records, tab["budget"], attempt)
+        except Exception as e:
+            logger.error(f"第 {attempt} 次提取页面失败: {e}")
+            return True, None
+
+    def _log_worker_summary(self, stats):
+        logger.info("=== Worker 吞吐统计 ===")
+        for stat in sorted(stats, key=lambda s: s["worker"]):
+            elapsed = stat["elapsed"]
+            rate = stat["characters"] / elapsed * 60 if elapsed > 0 else 0.0
+            logger.info(
+                f"worker {stat['worker']}: {stat['characters']} 个角色 "
+                f"({stat['failed']} 个失败, 重建浏览器 {stat['respawns']} 次, "
+                f"回收 {stat['recycles']} 次), {stat['records']} 条记录, "
+                f"耗时 {elapsed:.1f}s, {rate:.1f} 角色/分钟"
+                + ("" if stat["logged_in"] else " [未登录]")
+            )
+        total = sum(stat["characters"] for stat in stats)
+        wall = max((stat["elapsed"] for stat in stats), default=0.0)
+        if wall > 0:
+            logger.info(f"合计: {total} 个角色, 总耗时 {wall:.1f}s, {total / wall * 60:.1f} 角色/分钟")
+
+    def _generate_report(self, sink, char_df):
+        # 报告相关依赖（openpyxl、numpy 等）只在抓取完成后才导入
+        from utils.report_generator import ReportGenerator
+        from utils.html_visualizer import HTMLVisualizer
+
+        report_generator = ReportGenerator()
         try:
-            df = self.report_generator.prepare_dataframe(all_records)
+            df = report_generator.prepare_dataframe(sink.to_frame())
             if df is None:
                 return False
 
-            excel_success = self.report_generator.generate_excel_report(
+            excel_success = report_generator.generate_excel_report(
                 df, char_df, FILE_PATHS["result"]
             )
             if not excel_success:
@@ -244,10 +878,46 @@ class MythicPlusCrawler:
             logger.error(f"清理资源失败: {e}")
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="魔兽世界大秘境数据爬虫 (Blizzard 国服)")
+    parser.add_argument(
+        "--backend",
+        choices=["browser", "http", "async", "inpage"],
+        help="抓取方式，默认使用 CRAWLER_CONFIG['backend']",
+    )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        metavar="RUN_ID",
+        help="续跑中断的运行，跳过已完成的角色；不指定 RUN_ID 时续跑最近一次未完成的运行",
+    )
+    parser.add_argument(
+        "--driver",
+        choices=["selenium", "cdp"],
+        help="浏览器控制方式，默认使用 BROWSER_CONFIG['driver_backend']",
+    )
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="预加载模式：用第二个标签页提前加载下一个角色",
+    )
+    parser.add_argument(
+        "--tabs",
+        type=int,
+        metavar="N",
+        help="每个浏览器同时打开的标签页数，默认使用 CRAWLER_CONFIG['tabs']",
+    )
+    return parser.parse_args(argv)
+
+
 def main():
-    crawler = MythicPlusCrawler()
+    args = parse_args()
+    crawler = MythicPlusCrawler(
+        backend=args.backend, tabs=args.tabs, prefetch=args.prefetch, driver=args.driver
+    )
     try:
-        success = crawler.run_crawler()
+        success = crawler.run_crawler(resume=args.resume)
         if success:
             print("\n爬虫执行成功！")
         else:
@@ -0,0 +1,10 @@
+from utils.browser_manager import BrowserManager
+
+
+def test_chrome_arguments_are_all_switches():
+    # CdpDriver 与常驻浏览器服务直接把参数交给 Chrome，不带 -- 的参数会被当成要打开的网址
+    manager = BrowserManager()
+    manager.config = dict(manager.config, user_agent="Mozilla/5.0 (X11; Linux x86_64)")
+    args = manager.chrome_arguments()
+    assert "--user-agent=Mozilla/5.0 (X11; Linux x86_64)" in args
+    assert all(arg.startswith("--") for arg in args)
@@ -0,0 +1,25 @@
+from utils.run_record import RunRecord
+
+
+def test_time_round_trip_beyond_99_minutes():
+    for seconds in (0, 59, 62, 33 * 60 + 30, 99 * 60 + 59, 100 * 60, 125 * 60 + 30, 6000 + 7):
+        text = RunRecord.format_time(seconds)
+        assert RunRecord.parse_time(text) == seconds
+
+    assert RunRecord.format_time(6000) == "100:00"
+    assert RunRecord.parse_time("125:30") == 7530
+    assert RunRecord.parse_time("1:02") == 62
+
+
+def test_parse_time_rejects_malformed_text():
+    for text in ("未知", "", "12:3", "12:345", "+12 30:00", "30:00abc", None, 1800):
+        assert RunRecord.parse_time(text) is None
+
+
+def test_dict_round_trip():
+    rows = [
+        {"副本": "通天峰", "限时层数": 12, "通关时间": "105:20", "是否限时": "否"},
+        {"副本": "艾杰斯亚学院", "限时层数": 7, "通关时间": "29:59", "是否限时": "是"},
+        {"副本": "迈萨拉洞窟", "限时层数": None, "通关时间": "未知", "是否限时": "否"},
+    ]
+    assert [RunRecord.from_dict(row).to_dict() for row in rows] == rows
@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+import mplus_batch_crawler
+from mplus_batch_crawler import CrawlJob, MythicPlusCrawler
+from utils.data_processor import DataProcessor
+from utils.retry_queue import RetryQueue
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """只模拟标签页轮转用到的接口：跳转立即完成，页面总是就绪"""
+
+    def __init__(self, fail_navigations=()):
+        self.current_window_handle = "tab-0"
+        self.switch_to = FakeSwitchTo(self)
+        self.current_url = "about:blank"
+        self.navigations = 0
+        self.fail_navigations = set(fail_navigations)
+
+    def execute_script(self, script, *args):
+        if script == DataProcessor.MPLUS_READY_JS:
+            return "stone-slide"
+        self.navigations += 1
+        if self.navigations in self.fail_navigations:
+            raise RuntimeError("chrome not reachable")
+
+    def quit(self):
+        pass
+
+
+def make_crawler(monkeypatch, drivers, tabs=1):
+    monkeypatch.setitem(mplus_batch_crawler.BROWSER_CONFIG, "capture_network", False)
+    crawler = MythicPlusCrawler(tabs=tabs)
+    crawler._create_driver = lambda debug_port=None: (drivers.pop(0), None)
+    crawler._respawn_driver = lambda driver, leased_port, debug_port=None: (drivers.pop(0), None)
+    crawler._ensure_login = lambda driver: True
+    crawler._save_cookies = lambda driver: None
+    crawler._extract_page = lambda driver, marker, records, budget, attempt: [{"副本": "通天峰"}]
+    crawler.browser_manager.open_tabs = lambda driver, count: [f"tab-{i}" for i in range(count)]
+    crawler.browser_manager.should_recycle = lambda driver, pages: None
+    return crawler
+
+
+def run_worker(crawler, job_queue):
+    results, stats = {}, []
+    thread = threading.Thread(
+        target=crawler._crawl_tab_worker, args=(0, job_queue, results, stats), daemon=True
+    )
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "标签页 worker 未结束"
+    return results, stats
+
+
+def test_retry_queue_tracks_in_flight_tasks():
+    queue = RetryQueue(["a"], max_attempts=2, base_delay=0)
+    job, attempt = queue.try_get()
+    assert (job, attempt) == ("a", 1)
+    assert not queue.finished()
+
+    assert queue.task_done(job, attempt, failed=True) is not None
+    assert not queue.finished()
+    assert queue.get() == ("a", 2)
+    assert queue.task_done("a", 2, failed=True) is None
+    assert queue.finished()
+    assert queue.get() is None
+
+
+@pytest.mark.parametrize("tabs", [1, 2])
+def test_failed_navigation_is_retried(monkeypatch, tabs):
+    crawler = make_crawler(monkeypatch, [FakeDriver(fail_navigations={1}), FakeDriver()], tabs=tabs)
+    jobs = [CrawlJob(0, "p", "a", "s"), CrawlJob(1, "p", "b", "s")]
+    job_queue = RetryQueue(jobs, base_delay=0)
+
+    results, stats = run_worker(crawler, job_queue)
+
+    assert results == {0: 1, 1: 1}
+    assert job_queue.finished()
+    assert stats[0]["respawns"] == 1
+
+
+@pytest.mark.parametrize("tabs", [1, 2])
+def test_finished_job_reported_when_next_navigation_fails(monkeypatch, tabs):
+    # 前 tabs 次跳转各占一个标签页，下一次是 a 完成后同一标签页紧接着发起的
+    crawler = make_crawler(monkeypatch, [FakeDriver(fail_navigations={tabs + 1}), FakeDriver()], tabs=tabs)
+    jobs = [CrawlJob(i, "p", name, "s") for i, name in enumerate("abc")]
+    job_queue = RetryQueue(jobs, base_delay=0)
+
+    results, stats = run_worker(crawler, job_queue)
+
+    assert results == {0: 1, 1: 1, 2: 1}
+    assert job_queue.finished()
+    assert stats[0]["characters"] == 3
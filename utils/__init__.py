@@ -2,9 +2,22 @@
 Mythic Performance Tracker - 工具模块
 """
 
-from .logger import logger, Logger
-from .data_processor import DataProcessor
-from .report_generator import ReportGenerator
-from .browser_manager import BrowserManager
+import importlib
 
-__all__ = ['logger', 'Logger', 'DataProcessor', 'ReportGenerator', 'BrowserManager']
+# 按需导入：只生成报告时不会加载 selenium 等浏览器相关依赖
+_EXPORTS = {
+    'logger': '.logger',
+    'Logger': '.logger',
+    'DataProcessor': '.data_processor',
+    'ReportGenerator': '.report_generator',
+    'BrowserManager': '.browser_manager',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
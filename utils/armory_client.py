@@ -0,0 +1,83 @@
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import API_CONFIG, BROWSER_CONFIG
+from utils.logger import logger
+from utils.data_processor import DataProcessor
+from utils.browser_manager import BrowserManager
+
+
+class ArmoryHttpClient:
+    """不启动浏览器，直接用已保存的 Cookie 登录态请求 armory API"""
+
+    def __init__(self, browser_manager=None, config=None):
+        self.config = config or API_CONFIG
+        self.browser_manager = browser_manager or BrowserManager()
+        self.session = self._create_session()
+        self.cookie_count = self._load_cookies()
+
+    def _create_session(self):
+        session = requests.Session()
+        pool_size = int(self.config.get("pool_size", 8))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "User-Agent": BROWSER_CONFIG.get("user_agent", ""),
+            "Accept": "application/json, text/plain, */*",
+            "Referer": "https://wow.blizzard.cn/",
+            "Origin": "https://wow.blizzard.cn",
+        })
+        proxy = self.config.get("proxy")
+        if proxy:
+            session.proxies.update({"http": proxy, "https": proxy})
+        return session
+
+    def _load_cookies(self):
+        cookies = self.browser_manager.load_cookies()
+        for cookie in cookies:
+            name = cookie.get("name")
+            if not name:
+                continue
+            self.session.cookies.set(
+                name,
+                cookie.get("value", ""),
+                domain=cookie.get("domain"),
+                path=cookie.get("path", "/"),
+            )
+        return len(cookies)
+
+    def fetch_payload(self, server_name, character_name):
+        """请求单个角色的 API 数据，失败返回 None"""
+        url = DataProcessor.build_api_url(
+            server_name, character_name, self.config.get("endpoint", "/do")
+        )
+        try:
+            response = self.session.get(
+                url, timeout=self.config.get("timeout", 10), allow_redirects=False
+            )
+        except requests.RequestException as e:
+            logger.warning(f"API 请求失败 {character_name}（{server_name}）: {e}")
+            return None
+
+        if response.status_code in (301, 302, 401, 403):
+            logger.warning(f"API 返回 {response.status_code}，登录态可能已失效: {character_name}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"API 返回 {response.status_code}: {character_name}")
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            logger.warning(f"API 响应不是 JSON: {character_name}")
+            return None
+
+    def fetch_character(self, server_name, character_name):
+        """返回大秘境记录列表；请求失败或响应中没有可识别的数据时返回 None"""
+        payload = self.fetch_payload(server_name, character_name)
+        if payload is None:
+            return None
+        records = DataProcessor.extract_records_from_api_payload(payload)
+        return records or None
+
+    def close(self):
+        self.session.close()
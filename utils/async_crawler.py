@@ -0,0 +1,139 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+from config.settings import API_CONFIG, BROWSER_CONFIG
+from utils.logger import logger
+from utils.data_processor import DataProcessor
+from utils.browser_manager import BrowserManager
+
+try:
+    import aiohttp
+except ImportError:  # 可选依赖，仅 async 抓取模式需要
+    aiohttp = None
+
+
+class TokenBucket:
+    """令牌桶限速：每秒补充 rate 个令牌，最多积累 capacity 个"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncArmoryCrawler:
+    """asyncio 并发请求 armory API，信号量限制并发、按 host 令牌桶限速"""
+
+    def __init__(self, browser_manager=None, config=None):
+        self.config = config or API_CONFIG
+        self.browser_manager = browser_manager or BrowserManager()
+        self.concurrency = int(self.config.get("async_concurrency", 16))
+        self.rate = float(self.config.get("rate_per_host", 5))
+        self.burst = float(self.config.get("rate_burst", 10))
+        self.cookies = self.browser_manager.load_cookies()
+        self._buckets = {}
+
+    @staticmethod
+    def is_available():
+        return aiohttp is not None
+
+    def _bucket_for(self, url):
+        host = urlparse(url).hostname or ""
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    def _cookie_header(self, url):
+        host = urlparse(url).hostname or ""
+        pairs = []
+        for cookie in self.cookies:
+            domain = (cookie.get("domain") or "").lstrip(".")
+            if domain and (host == domain or host.endswith("." + domain)):
+                pairs.append(f"{cookie.get('name')}={cookie.get('value', '')}")
+        return "; ".join(pairs)
+
+    @staticmethod
+    def attach_identity(job, records):
+        """补充玩家/角色名/服务器列，得到 ReportGenerator.prepare_dataframe 的输入格式"""
+        for record in records:
+            record.update({
+                "玩家": job.player,
+                "角色名": job.name,
+                "服务器": job.server,
+            })
+        return records
+
+    async def _fetch(self, session, semaphore, job):
+        url = DataProcessor.build_api_url(job.server, job.name, self.config.get("endpoint", "/do"))
+        headers = {}
+        cookie_header = self._cookie_header(url)
+        if cookie_header:
+            headers["Cookie"] = cookie_header
+
+        async with semaphore:
+            await self._bucket_for(url).acquire()
+            try:
+                async with session.get(
+                    url,
+                    headers=headers,
+                    proxy=self.config.get("proxy"),
+                    allow_redirects=False,
+                ) as response:
+                    if response.status != 200:
+                        logger.warning(f"[async] API 返回 {response.status}: {job.name}")
+                        return job, None
+                    payload = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"[async] API 请求失败 {job.name}（{job.server}）: {e}")
+                return job, None
+
+        records = DataProcessor.extract_records_from_api_payload(payload)
+        return job, (self.attach_identity(job, records) if records else None)
+
+    async def iter_results(self, jobs):
+        """按完成顺序逐个产出 (job, records)，records 为 None 表示失败或无数据"""
+        if aiohttp is None:
+            raise RuntimeError("async 抓取模式需要安装 aiohttp")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.config.get("timeout", 10))
+        headers = {
+            "User-Agent": BROWSER_CONFIG.get("user_agent", ""),
+            "Accept": "application/json, text/plain, */*",
+            "Referer": "https://wow.blizzard.cn/",
+            "Origin": "https://wow.blizzard.cn",
+        }
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(
+            timeout=timeout, headers=headers, connector=connector
+        ) as session:
+            tasks = [asyncio.ensure_future(self._fetch(session, semaphore, job)) for job in jobs]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def crawl(self, jobs, on_result=None):
+        results = {}
+        async for job, records in self.iter_results(jobs):
+            results[job.index] = records
+            if on_result:
+                on_result(job, records)
+            if records:
+                logger.info(f"[async] {job.player} / {job.name}（{job.server}）: {len(records)} 条记录")
+        return results
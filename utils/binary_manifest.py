@@ -0,0 +1,92 @@
+import os
+import re
+import json
+import time
+import threading
+import subprocess
+from config.settings import FILE_PATHS
+from utils.logger import logger
+
+VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)\.(\d+)(?:\.(\d+))?")
+
+
+class BinaryManifest:
+    """缓存已找到的 chromedriver / Chrome 路径及版本。
+    可执行文件的大小或修改时间变化后缓存失效，否则启动时不再扫描路径、不访问网络"""
+
+    _lock = threading.Lock()
+
+    def __init__(self, path=None):
+        self.path = path or FILE_PATHS["binary_manifest"]
+        self._entries = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取可执行文件缓存失败，将重新查找: {e}")
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def probe_version(path):
+        """读取可执行文件的版本号，失败返回 None。
+        Windows 上 chrome.exe --version 会直接启动浏览器而不输出版本，改读文件版本信息"""
+        if os.name == "nt" and "chromedriver" not in os.path.basename(path).lower():
+            literal = path.replace("'", "''")
+            command = [
+                "powershell", "-NoProfile", "-NonInteractive", "-Command",
+                f"(Get-Item -LiteralPath '{literal}').VersionInfo.ProductVersion",
+            ]
+        else:
+            command = [path, "--version"]
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=15).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        match = VERSION_PATTERN.search(output or "")
+        return match.group(0) if match else None
+
+    @staticmethod
+    def major_version(version):
+        match = VERSION_PATTERN.search(version or "")
+        return int(match.group(1)) if match else None
+
+    def lookup(self, name):
+        """返回仍然有效的缓存条目 {path, mtime, size, version}，没有则返回 None"""
+        entry = self._entries.get(name)
+        if not entry:
+            return None
+        try:
+            stat = os.stat(entry["path"])
+        except OSError:
+            return None
+        if stat.st_mtime != entry.get("mtime") or stat.st_size != entry.get("size"):
+            logger.info(f"{name} 已更新，重新识别: {entry['path']}")
+            return None
+        return entry
+
+    def record(self, name, path, **extra):
+        stat = os.stat(path)
+        entry = {
+            "path": os.path.abspath(path),
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "version": self.probe_version(path),
+            "resolved_at": time.time(),
+        }
+        entry.update(extra)
+        with self._lock:
+            self._entries[name] = entry
+            self._save()
+        logger.info(f"已缓存 {name}: {entry['path']}（版本 {entry['version'] or '未知'}）")
+        return entry
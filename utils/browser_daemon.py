@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import signal
+import subprocess
+import urllib.request
+from config.settings import DAEMON_CONFIG, FILE_PATHS
+from utils.logger import logger
+from utils.browser_manager import BrowserManager
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class BrowserDaemon:
+    """常驻浏览器服务：保持若干个已预热的 Chrome 实例并定期做健康检查，
+    爬虫通过调试端口连接复用，省去每次运行冷启动浏览器和重新登录的开销"""
+
+    def __init__(self, browser_manager=None, config=None, directory=None):
+        self.config = config or DAEMON_CONFIG
+        self.directory = directory or FILE_PATHS["browser_daemon_dir"]
+        self.browser_manager = browser_manager or BrowserManager()
+        self.instances = {}  # port -> {process, started_at, restarts, failures}
+        self._stopping = False
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def state_path(directory=None):
+        return os.path.join(directory or FILE_PATHS["browser_daemon_dir"], "state.json")
+
+    @staticmethod
+    def lease_path(port, directory=None):
+        return os.path.join(directory or FILE_PATHS["browser_daemon_dir"], f"{port}.lease")
+
+    @staticmethod
+    def unhealthy_path(port, directory=None):
+        return os.path.join(directory or FILE_PATHS["browser_daemon_dir"], f"{port}.unhealthy")
+
+    @staticmethod
+    def probe(port, timeout=5):
+        """请求 /json/version 检查实例是否响应，失败返回 None"""
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+        try:
+            with opener.open(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _ports(self):
+        base_port = int(self.config.get("base_port", 9300))
+        return [base_port + i for i in range(int(self.config.get("instances", 2)))]
+
+    def _profile_dir(self, port):
+        return os.path.join(self.browser_manager._get_session_dir(), f"daemon_{port}")
+
+    def start_instance(self, port, restarts=0):
+        chrome_binary = self.browser_manager.get_chrome_binary_path()
+        if not chrome_binary:
+            raise FileNotFoundError("无法找到 Chrome 可执行文件")
+        try:
+            # 新启动的实例不继承上一个实例的异常标记
+            os.remove(self.unhealthy_path(port, self.directory))
+        except OSError:
+            pass
+        args = [
+            chrome_binary,
+            *self.browser_manager.chrome_arguments(),
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={self._profile_dir(port)}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "about:blank",
+        ]
+        process = subprocess.Popen(
+            args,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=os.name != "nt",
+        )
+        self.instances[port] = {
+            "process": process,
+            "started_at": time.time(),
+            "restarts": restarts,
+            "failures": 0,
+        }
+
+        deadline = time.time() + 20
+        while time.time() < deadline:
+            if process.poll() is not None:
+                logger.error(f"常驻浏览器 {port} 启动后立即退出（返回码 {process.returncode}）")
+                return False
+            if self.probe(port, timeout=1):
+                logger.success(f"常驻浏览器 {port} 已启动（pid {process.pid}）")
+                return True
+            time.sleep(0.5)
+        logger.warning(f"常驻浏览器 {port} 启动后未响应调试端口")
+        return False
+
+    def stop_instance(self, port):
+        info = self.instances.pop(port, None)
+        if not info:
+            return
+        process = info["process"]
+        if process.poll() is None:
+            self.browser_manager.kill_process_tree(process.pid)
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"常驻浏览器 {port} 未能在 10s 内退出")
+
+    def restart_instance(self, port, reason):
+        restarts = self.instances.get(port, {}).get("restarts", 0) + 1
+        logger.warning(f"常驻浏览器 {port} {reason}，重启（第 {restarts} 次）")
+        self.stop_instance(port)
+        self.start_instance(port, restarts)
+
+    def check_instance(self, port):
+        """健康检查，需要重启时返回原因，否则返回 None"""
+        info = self.instances[port]
+        process = info["process"]
+        if process.poll() is not None:
+            return f"进程已退出（返回码 {process.returncode}）"
+
+        unhealthy_path = self.unhealthy_path(port, self.directory)
+        if os.path.exists(unhealthy_path):
+            try:
+                os.remove(unhealthy_path)
+            except OSError:
+                pass
+            return "被爬虫报告为无响应"
+
+        if self.probe(port, timeout=self.config.get("health_timeout", 5)) is None:
+            info["failures"] += 1
+            max_failures = int(self.config.get("max_failures", 3))
+            if info["failures"] >= max_failures:
+                return f"连续 {info['failures']} 次健康检查无响应"
+            return None
+        info["failures"] = 0
+
+        # 爬虫正在使用时不因内存重启，等它释放后再回收
+        max_rss = self.config.get("max_rss_mb")
+        if max_rss and self.lease_holder(port, self.directory) is None:
+            rss = self.browser_manager.process_tree_rss_mb(process.pid)
+            if rss is not None and rss >= max_rss:
+                return f"内存占用 {rss:.0f}MB"
+        return None
+
+    def write_state(self):
+        state = {
+            "pid": os.getpid(),
+            "updated_at": time.time(),
+            "instances": [
+                {
+                    "port": port,
+                    "pid": info["process"].pid,
+                    "started_at": info["started_at"],
+                    "restarts": info["restarts"],
+                }
+                for port, info in sorted(self.instances.items())
+            ],
+        }
+        path = self.state_path(self.directory)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def _handle_signal(self, signum, frame):
+        logger.info(f"收到信号 {signum}，准备关闭常驻浏览器")
+        self._stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        for port in self._ports():
+            self.start_instance(port)
+        interval = float(self.config.get("health_interval", 30))
+        try:
+            while not self._stopping:
+                self.write_state()
+                next_check = time.time() + interval
+                while not self._stopping and time.time() < next_check:
+                    time.sleep(0.5)
+                if self._stopping:
+                    break
+                for port in list(self.instances):
+                    reason = self.check_instance(port)
+                    if reason:
+                        self.restart_instance(port, reason)
+        finally:
+            for port in list(self.instances):
+                self.stop_instance(port)
+            try:
+                os.remove(self.state_path(self.directory))
+            except OSError:
+                pass
+            logger.info("常驻浏览器服务已退出")
+
+    # ---- 以下供爬虫连接使用 ----
+
+    @classmethod
+    def available_ports(cls, directory=None, timeout=2):
+        """返回服务正在运行且调试端口有响应的实例端口"""
+        try:
+            with open(cls.state_path(directory), "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if not _pid_alive(int(state.get("pid", 0))):
+            return []
+        return [
+            instance["port"]
+            for instance in state.get("instances", [])
+            if not os.path.exists(cls.unhealthy_path(instance["port"], directory))
+            and cls.probe(instance["port"], timeout=timeout)
+        ]
+
+    @classmethod
+    def lease_holder(cls, port, directory=None):
+        """返回持有该实例租约且仍存活的进程 pid，没有则返回 None"""
+        try:
+            with open(cls.lease_path(port, directory), "r") as f:
+                pid = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return None
+        return pid if pid and _pid_alive(pid) else None
+
+    @classmethod
+    def _try_lease(cls, port, directory=None):
+        path = cls.lease_path(port, directory)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if cls.lease_holder(port, directory) is not None:
+                    return False
+                # 持有者已退出，清掉过期租约后重试
+                try:
+                    os.remove(path)
+                except OSError:
+                    return False
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    @classmethod
+    def acquire(cls, directory=None):
+        """占用一个空闲的常驻实例，返回端口；没有可用实例时返回 None"""
+        for port in cls.available_ports(directory):
+            if cls._try_lease(port, directory):
+                return port
+        return None
+
+    @classmethod
+    def mark_unhealthy(cls, port, directory=None):
+        """报告实例已卡死：服务端下次健康检查时重启它，在此之前不再分配给爬虫"""
+        try:
+            with open(cls.unhealthy_path(port, directory), "w") as f:
+                f.write(str(os.getpid()))
+        except OSError as e:
+            logger.debug(f"标记常驻浏览器 {port} 异常失败: {e}")
+
+    @classmethod
+    def release(cls, port, directory=None):
+        try:
+            os.remove(cls.lease_path(port, directory))
+        except OSError:
+            pass
@@ -1,26 +1,47 @@
 import time
 import os
-import pickle
 import json
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
+import signal
+import threading
+from contextlib import contextmanager
 from config.settings import BROWSER_CONFIG, SESSION_CONFIG
 from utils.logger import logger
-from utils.platform_utils import platform_utils
+from utils.platform_utils import get_platform_utils
+from utils.cookie_store import CookieStore
+from utils.binary_manifest import BinaryManifest
 
 
 class BrowserManager:
+    # 同一进程内多次创建浏览器时直接复用已解析的可执行文件
+    _binaries = {}
+    _binaries_lock = threading.RLock()
+
     def __init__(self):
         self.config = BROWSER_CONFIG
         self.session_config = SESSION_CONFIG
+        self._launch_args = {}
+        self._cookie_store = None
 
     def get_cookie_file(self):
-        data_dir = self._get_session_dir()
-        return os.path.join(data_dir, "cookies.pkl")
+        return self.cookie_store.path
+
+    @property
+    def cookie_store(self):
+        if self._cookie_store is None:
+            self._cookie_store = CookieStore(self._get_session_dir(), self.session_config)
+        return self._cookie_store
+
+    def load_cookies(self):
+        cookies = self.cookie_store.cookies()
+        if not cookies:
+            logger.info(f"没有可用的 Cookie: {self.cookie_store.path}")
+        return cookies
+
+    def save_cookies(self, cookies, authenticated=False):
+        return self.cookie_store.save(cookies, authenticated=authenticated)
+
+    def is_session_fresh(self):
+        return self.cookie_store.is_session_fresh()
 
     def _get_session_dir(self):
         project_root = os.getcwd()
@@ -29,91 +50,242 @@ class BrowserManager:
         os.makedirs(data_dir, exist_ok=True)
         return data_dir
 
-    def create_driver(self, use_persistent_session=True, headless=None):
+    def chrome_arguments(self, headless=None):
+        """按配置生成 Chrome 启动参数（不含调试端口），常驻浏览器服务也使用同一套参数"""
+        args = []
+        is_headless = self.config.get("headless") if headless is None else headless
+        if is_headless:
+            args.append("--headless=new")
+        if self.config.get("disable_gpu"):
+            args.append("--disable-gpu")
+        if self.config.get("no_sandbox"):
+            args.append("--no-sandbox")
+        if self.config.get("disable_dev_shm_usage"):
+            args.append("--disable-dev-shm-usage")
+        if self.config.get("disable_setuid_sandbox"):
+            args.append("--disable-setuid-sandbox")
+        if self.config.get("log_level"):
+            args.append(f"--log-level={self.config['log_level']}")
+        if self.config.get("proxy_server"):
+            args.append(f"--proxy-server={self.config['proxy_server']}")
+        if self.config.get("window_size"):
+            args.append(f"--window-size={self.config['window_size']}")
+        if self.config.get("user_agent"):
+            args.append(f"--user-agent={self.config['user_agent']}")
+        if self.config.get("disable_extensions"):
+            args.append("--disable-extensions")
+        if self.config.get("disable_plugins"):
+            args.append("--disable-plugins")
+
+        blink_settings = dict(self.config.get("blink_settings") or {})
+        if self.config.get("disable_images"):
+            blink_settings["imagesEnabled"] = False
+        if blink_settings:
+            value = ",".join(
+                f"{key}={str(val).lower() if isinstance(val, bool) else val}"
+                for key, val in blink_settings.items()
+            )
+            args.append(f"--blink-settings={value}")
+
+        if self.config.get("disable_background_throttling"):
+            # 多标签页并发时后台标签页不能被降频，否则只有前台标签页在加载
+            args.append("--disable-background-timer-throttling")
+            args.append("--disable-backgrounding-occluded-windows")
+            args.append("--disable-renderer-backgrounding")
+
+        args.append("--no-proxy-server")
+        args.append("--disable-blink-features=AutomationControlled")
+
+        platform_config = get_platform_utils().get_platform_config()
+        browser_options = platform_config.get("browser_options", {})
+        if is_headless and browser_options.get("headless_arg"):
+            args.append(browser_options["headless_arg"])
+        for key in ("gpu_arg", "sandbox_arg", "xvfb_arg"):
+            if browser_options.get(key):
+                args.append(browser_options[key])
+        return args
+
+    def _launch_options(self, headless, debug_port):
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        for arg in self.chrome_arguments(headless):
+            options.add_argument(arg)
+        if self.config.get("page_load_strategy"):
+            options.page_load_strategy = self.config["page_load_strategy"]
+        if self.config.get("disable_images"):
+            options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        options.add_argument(f"--remote-debugging-port={debug_port}")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+
+        chrome_binary = self.get_chrome_binary_path()
+        if chrome_binary:
+            options.binary_location = chrome_binary
+        return options
+
+    def _attach_options(self, debugger_address):
+        """连接已在运行的 Chrome（常驻浏览器服务），启动参数由服务端决定"""
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        options.debugger_address = debugger_address
+        if self.config.get("page_load_strategy"):
+            options.page_load_strategy = self.config["page_load_strategy"]
+        return options
+
+    def driver_backend(self):
+        """selenium: 经 chromedriver 控制浏览器；cdp: 直接走 DevTools 协议，不需要 chromedriver"""
+        backend = self.config.get("driver_backend", "selenium")
+        if backend != "cdp":
+            return backend
+        # cdp_driver 会导入 websocket，只在选用 cdp 驱动时才加载
+        from utils.cdp_driver import CdpDriver
+
+        if not CdpDriver.is_available():
+            logger.warning("未安装 websocket-client，cdp 驱动改用 selenium")
+            return "selenium"
+        return backend
+
+    def _start_selenium(self, headless, debug_port, debugger_address):
+        # selenium 只在使用 selenium 驱动时才导入，cdp 驱动和纯 API 抓取不需要
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        chromedriver_path = self._get_chromedriver_path()
+        if not chromedriver_path:
+            raise FileNotFoundError("无法找到chromedriver文件")
+
+        if debugger_address:
+            options = self._attach_options(debugger_address)
+        else:
+            options = self._launch_options(headless, debug_port)
+        if self.config.get("capture_network"):
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+        service = Service(executable_path=chromedriver_path)
+        return webdriver.Chrome(service=service, options=options)
+
+    def _start_cdp(self, headless, debugger_address):
+        from utils.cdp_driver import CdpDriver
+
+        strategy = self.config.get("page_load_strategy")
+        if debugger_address:
+            return CdpDriver.attach(debugger_address, page_load_strategy=strategy)
+        chrome_binary = self.get_chrome_binary_path()
+        if not chrome_binary:
+            raise FileNotFoundError("无法找到 Chrome 可执行文件")
+        return CdpDriver.launch(chrome_binary, self.chrome_arguments(headless), page_load_strategy=strategy)
+
+    def create_driver(self, use_persistent_session=True, headless=None, debug_port=None,
+                      debugger_address=None):
         try:
-            chromedriver_path = self._get_chromedriver_path()
-
             os.environ.setdefault("no_proxy", "localhost,127.0.0.1,::1")
             os.environ.setdefault("NO_PROXY", "localhost,127.0.0.1,::1")
-            if not chromedriver_path:
-                raise FileNotFoundError("无法找到chromedriver文件")
-
-            options = Options()
-
-            is_headless = self.config.get("headless") if headless is None else headless
-            if is_headless:
-                options.add_argument("--headless=new")
-            if self.config.get("disable_gpu"):
-                options.add_argument("--disable-gpu")
-            if self.config.get("no_sandbox"):
-                options.add_argument("--no-sandbox")
-            if self.config.get("disable_dev_shm_usage"):
-                options.add_argument("--disable-dev-shm-usage")
-            if self.config.get("disable_setuid_sandbox"):
-                options.add_argument("--disable-setuid-sandbox")
-            if self.config.get("log_level"):
-                options.add_argument(f"--log-level={self.config['log_level']}")
-            if self.config.get("proxy_server"):
-                options.add_argument(f"--proxy-server={self.config['proxy_server']}")
-            if self.config.get("page_load_strategy"):
-                options.page_load_strategy = self.config["page_load_strategy"]
-            if self.config.get("window_size"):
-                options.add_argument(f"--window-size={self.config['window_size']}")
-            if self.config.get("user_agent"):
-                options.add_argument(f"user-agent={self.config['user_agent']}")
-
-            options.add_argument("--remote-debugging-port=9222")
-            options.add_argument("--no-proxy-server")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option("useAutomationExtension", False)
-
-            platform_config = platform_utils.get_platform_config()
-            browser_options = platform_config.get("browser_options", {})
-
-            if is_headless and browser_options.get("headless_arg"):
-                options.add_argument(browser_options["headless_arg"])
-            if browser_options.get("gpu_arg"):
-                options.add_argument(browser_options["gpu_arg"])
-            if browser_options.get("sandbox_arg"):
-                options.add_argument(browser_options["sandbox_arg"])
-            if browser_options.get("xvfb_arg"):
-                options.add_argument(browser_options["xvfb_arg"])
-
-            chrome_binary = platform_utils.get_chrome_binary_path()
-            if chrome_binary:
-                options.binary_location = chrome_binary
-
-            service = Service(executable_path=chromedriver_path)
-
-            driver = webdriver.Chrome(service=service, options=options)
 
-            driver.execute_cdp_cmd(
-                "Page.addScriptToEvaluateOnNewDocument",
-                {
-                    "source": """
-                Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-                Object.defineProperty(navigator, 'plugins', { get: () => [1,2,3,4,5] });
-                Object.defineProperty(navigator, 'languages', { get: () => ['zh-CN', 'zh', 'en'] });
-                """
-                },
-            )
-
-            logger.success("浏览器驱动创建成功")
+            if debug_port is None and not debugger_address:
+                debug_port = self.config.get("remote_debugging_port", 9222)
+            if self.driver_backend() == "cdp":
+                driver = self._start_cdp(headless, debugger_address)
+            else:
+                driver = self._start_selenium(headless, debug_port, debugger_address)
+
+            self._setup_tab(driver)
+
+            if self.config.get("page_load_timeout"):
+                driver.set_page_load_timeout(self.config["page_load_timeout"])
+            if self.config.get("script_timeout"):
+                driver.set_script_timeout(self.config["script_timeout"])
+
+            self._launch_args[driver.session_id] = {
+                "use_persistent_session": use_persistent_session,
+                "headless": headless,
+                "debug_port": debug_port,
+                "debugger_address": debugger_address,
+            }
+            if debugger_address:
+                logger.success(f"已连接常驻浏览器 {debugger_address}")
+            else:
+                logger.success("浏览器驱动创建成功")
             return driver
 
         except Exception as e:
             logger.error(f"创建浏览器驱动失败: {e}")
             raise
 
-    def inject_cookies(self, driver):
-        cookie_file = self.get_cookie_file()
-        if not os.path.exists(cookie_file):
-            logger.info(f"Cookie 文件不存在: {cookie_file}")
+    def _setup_tab(self, driver):
+        """当前标签页的 CDP 设置：隐藏自动化特征、开启网络事件、拦截不需要的资源。
+        selenium 下 execute_cdp_cmd 只作用于当前标签页，新开的标签页要重新下发"""
+        driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument",
+            {
+                "source": """
+            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+            Object.defineProperty(navigator, 'plugins', { get: () => [1,2,3,4,5] });
+            Object.defineProperty(navigator, 'languages', { get: () => ['zh-CN', 'zh', 'en'] });
+            """
+            },
+        )
+
+        blocked_urls = self.config.get("blocked_url_patterns") or []
+        if self.config.get("capture_network") or blocked_urls:
+            driver.execute_cdp_cmd("Network.enable", {})
+        if blocked_urls:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocked_urls)})
+
+    @staticmethod
+    def filter_unexpired_cookies(cookies, now=None):
+        """丢弃本地已过期的 Cookie（没有 expiry 的会话 Cookie 保留）"""
+        now = now or time.time()
+        return [c for c in cookies if not c.get("expiry") or float(c["expiry"]) > now]
+
+    @staticmethod
+    def _to_cdp_cookie(cookie):
+        c = {
+            "name": cookie.get("name"),
+            "value": cookie.get("value", ""),
+            "domain": cookie.get("domain"),
+            "path": cookie.get("path", "/"),
+        }
+        if cookie.get("secure"):
+            c["secure"] = True
+        if cookie.get("httpOnly"):
+            c["httpOnly"] = True
+        if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+            c["sameSite"] = cookie["sameSite"]
+        if cookie.get("expiry"):
+            c["expires"] = float(cookie["expiry"])
+        return c
+
+    def inject_cookies(self, driver, cookies=None):
+        """在首次导航前通过 CDP Network.setCookies 一次性写入所有域的 Cookie，
+        CDP 不可用时退回逐个 add_cookie"""
+        if cookies is None:
+            cookies = self.load_cookies()
+        if not cookies:
             return False
+
+        valid = self.filter_unexpired_cookies(cookies)
+        if len(valid) < len(cookies):
+            logger.info(f"丢弃 {len(cookies) - len(valid)} 个已过期的 Cookie")
+        if not valid:
+            logger.warning("Cookie 已全部过期，需要重新登录")
+            return False
+
+        try:
+            driver.execute_cdp_cmd(
+                "Network.setCookies", {"cookies": [self._to_cdp_cookie(c) for c in valid]}
+            )
+            logger.info(f"已通过 CDP 注入 {len(valid)} 个 Cookie")
+            return True
+        except Exception as e:
+            logger.debug(f"CDP 注入 Cookie 失败，改用逐个注入: {e}")
+            return self._inject_cookies_webdriver(driver, valid)
+
+    def _inject_cookies_webdriver(self, driver, cookies):
         try:
-            with open(cookie_file, "rb") as f:
-                cookies = pickle.load(f)
             driver.get("https://wow.blizzard.cn/")
             time.sleep(2)
             for cookie in cookies:
@@ -142,14 +314,280 @@ class BrowserManager:
             logger.warning(f"注入 Cookie 失败: {e}")
             return False
 
+    def read_network_events(self, driver):
+        """读取并清空 performance 日志，返回 CDP 事件列表 [{method, params, webview}]，
+        webview 是事件所属标签页的 target id（与 window handle 相同）"""
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"读取 performance 日志失败: {e}")
+            return []
+        events = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])
+                event = message["message"]
+                event["webview"] = message.get("webview")
+                events.append(event)
+            except (KeyError, TypeError, ValueError):
+                continue
+        return events
+
+    @staticmethod
+    def summarize_transfer(events):
+        """统计 CDP 事件中的请求数、实际传输字节数和被拦截的请求数。
+        被拦截的请求不会产生传输，无法得知其大小，只统计数量"""
+        summary = {"requests": 0, "bytes": 0, "blocked": 0, "failed": 0}
+        for event in events:
+            method = event.get("method")
+            params = event.get("params", {})
+            if method == "Network.loadingFinished":
+                summary["requests"] += 1
+                summary["bytes"] += int(params.get("encodedDataLength") or 0)
+            elif method == "Network.loadingFailed":
+                if params.get("blockedReason"):
+                    summary["blocked"] += 1
+                else:
+                    summary["failed"] += 1
+        return summary
+
+    def collect_json_responses(self, driver, events, url_prefix, pending=None, url_filter=None):
+        """从 CDP 事件中取出 url_prefix 下已加载完成的 JSON 响应体。
+        pending 保存已收到响应头、尚未加载完成的请求，可跨多次调用传入；
+        url_filter(url) 返回 False 的响应直接忽略，不读取响应体"""
+        if pending is None:
+            pending = {}
+        payloads = []
+        for event in events:
+            method = event.get("method")
+            params = event.get("params", {})
+            if method == "Network.responseReceived":
+                url = params.get("response", {}).get("url", "")
+                if url.startswith(url_prefix) and (url_filter is None or url_filter(url)):
+                    pending[params.get("requestId")] = url
+            elif method == "Network.loadingFinished":
+                url = pending.pop(params.get("requestId"), None)
+                if not url:
+                    continue
+                try:
+                    body = driver.execute_cdp_cmd(
+                        "Network.getResponseBody", {"requestId": params["requestId"]}
+                    )
+                    text = body.get("body", "")
+                    if body.get("base64Encoded"):
+                        import base64
+                        text = base64.b64decode(text).decode("utf-8", errors="replace")
+                    payloads.append((url, json.loads(text)))
+                except Exception as e:
+                    logger.debug(f"读取响应体失败 {url}: {e}")
+        return payloads
+
     def safe_quit(self, driver):
         try:
             if driver:
+                self._launch_args.pop(getattr(driver, "session_id", None), None)
                 driver.quit()
                 logger.info("浏览器已安全退出")
         except Exception as e:
             logger.warning(f"退出浏览器时出现错误: {e}")
 
+    @staticmethod
+    def _process_tree(pid):
+        """返回 pid 及其全部子孙进程的 pid 列表"""
+        try:
+            import psutil
+            root = psutil.Process(pid)
+            return [pid] + [child.pid for child in root.children(recursive=True)]
+        except ImportError:
+            pass
+        except Exception:
+            return [pid]
+
+        children = {}
+        if os.path.isdir("/proc"):
+            for entry in os.listdir("/proc"):
+                if not entry.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{entry}/stat", "r") as f:
+                        stat = f.read()
+                    ppid = int(stat.rsplit(")", 1)[1].split()[1])
+                except (OSError, ValueError, IndexError):
+                    continue
+                children.setdefault(ppid, []).append(int(entry))
+        tree, stack = [], [pid]
+        while stack:
+            current = stack.pop()
+            tree.append(current)
+            stack.extend(children.get(current, []))
+        return tree
+
+    def kill_driver_processes(self, driver):
+        """强制结束 chromedriver 及其启动的 Chrome 进程"""
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is None:
+            return
+        self.kill_process_tree(process.pid)
+
+    def kill_process_tree(self, pid):
+        for child in reversed(self._process_tree(pid)):
+            try:
+                os.kill(child, getattr(signal, "SIGKILL", signal.SIGTERM))
+            except OSError:
+                continue
+
+    @contextmanager
+    def watchdog(self, driver, deadline, label="浏览器操作"):
+        """deadline 秒内未结束则强制结束浏览器进程，使阻塞中的 WebDriver 调用立即抛错。
+        yield 的 Event 被置位表示已触发，driver 已不可用"""
+        fired = threading.Event()
+
+        def _kill():
+            fired.set()
+            logger.warning(f"{label} 超过 {deadline}s 未完成，强制结束浏览器进程")
+            self.kill_driver_processes(driver)
+
+        timer = threading.Timer(deadline, _kill)
+        timer.daemon = True
+        timer.start()
+        try:
+            yield fired
+        finally:
+            timer.cancel()
+
+    def respawn_driver(self, driver, carry_cookies=False):
+        """结束旧的浏览器并以相同参数重建，重新注入 Cookie。
+        carry_cookies 为 True 时旧浏览器仍然正常：从旧会话取 Cookie 后正常退出；
+        否则直接结束旧进程并读取 Cookie 文件"""
+        launch_args = self._launch_args.get(getattr(driver, "session_id", None), {})
+        cookies = None
+        if carry_cookies:
+            try:
+                cookies = driver.get_cookies()
+            except Exception as e:
+                logger.debug(f"读取旧会话 Cookie 失败，改用 Cookie 文件: {e}")
+        else:
+            # 旧浏览器可能已经卡死，先强制结束进程，避免 quit 阻塞
+            self.kill_driver_processes(driver)
+        self.safe_quit(driver)
+        new_driver = self.create_driver(**launch_args)
+        self.inject_cookies(new_driver, cookies or None)
+        return new_driver
+
+    def driver_rss_mb(self, driver):
+        """chromedriver 及其 Chrome 进程树的常驻内存合计（MB），无法获取时返回 None"""
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is None:
+            return None
+        return self.process_tree_rss_mb(process.pid)
+
+    def process_tree_rss_mb(self, pid):
+        """pid 及其子孙进程的常驻内存合计（MB），无法获取时返回 None"""
+        pids = self._process_tree(pid)
+        try:
+            import psutil
+            total = 0
+            for pid in pids:
+                try:
+                    total += psutil.Process(pid).memory_info().rss
+                except psutil.Error:
+                    continue
+            return total / (1024 * 1024)
+        except ImportError:
+            pass
+
+        if not os.path.isdir("/proc"):
+            return None
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        total = 0
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/statm", "r") as f:
+                    total += int(f.read().split()[1]) * page_size
+            except (OSError, ValueError, IndexError):
+                continue
+        return total / (1024 * 1024)
+
+    def is_attached(self, driver):
+        """driver 是否连接的是常驻浏览器服务（浏览器进程不归本进程管理）"""
+        launch_args = self._launch_args.get(getattr(driver, "session_id", None), {})
+        return bool(launch_args.get("debugger_address"))
+
+    def should_recycle(self, driver, pages):
+        """按已加载页面数和进程树内存判断是否需要重启浏览器，返回原因或 None。
+        常驻浏览器由服务端的健康检查负责回收"""
+        if self.is_attached(driver):
+            return None
+        max_pages = self.config.get("recycle_after_pages")
+        if max_pages and pages >= max_pages:
+            return f"已加载 {pages} 个页面"
+        max_rss = self.config.get("recycle_rss_mb")
+        interval = max(1, int(self.config.get("recycle_check_interval", 5)))
+        if max_rss and pages and pages % interval == 0:
+            rss = self.driver_rss_mb(driver)
+            if rss is not None and rss >= max_rss:
+                return f"内存占用 {rss:.0f}MB"
+        return None
+
+    def recycle_driver(self, driver):
+        """重启浏览器释放内存，当前会话的 Cookie 原样带到新浏览器"""
+        return self.respawn_driver(driver, carry_cookies=True)
+
+    def navigate_hash(self, driver, url, before_script=""):
+        """SPA 已加载时只修改 location.hash 切换路由，否则整页加载。
+        before_script 在切换前执行（用于标记旧内容），返回实际使用的方式 'hash' / 'reload'"""
+        base, _, fragment = url.partition("#")
+        try:
+            current = driver.current_url or ""
+        except Exception:
+            current = ""
+        if not fragment or current.partition("#")[0] != base:
+            driver.get(url)
+            return "reload"
+        driver.execute_script(before_script + "\nwindow.location.hash = arguments[0];", "#" + fragment)
+        return "hash"
+
+    def start_navigation(self, driver, url, before_script="", reload=False):
+        """在当前标签页发起跳转但不等待加载完成，供多标签页轮转使用。
+        SPA 已加载且未要求 reload 时只修改 hash，否则整页加载，返回 'hash' / 'reload'"""
+        base, _, fragment = url.partition("#")
+        try:
+            current = driver.current_url or ""
+        except Exception:
+            current = ""
+        same_document = bool(fragment) and current.partition("#")[0] == base
+        if same_document and not reload:
+            driver.execute_script(before_script + "\nwindow.location.hash = arguments[0];", "#" + fragment)
+            return "hash"
+        # 只有 hash 不同时设置 href 不会重新加载，需要再调用 reload
+        driver.execute_script(
+            "window.location.href = arguments[0]; if (arguments[1]) { window.location.reload(); }",
+            url,
+            same_document,
+        )
+        return "reload"
+
+    def open_tabs(self, driver, count):
+        """在同一个 Chrome 中准备 count 个标签页，返回 window handle 列表（含当前标签页）"""
+        # 连接常驻浏览器时复用已经打开的标签页
+        configured = driver.current_window_handle
+        handles = list(driver.window_handles)[:count]
+        if configured not in handles:
+            handles = [configured] + handles[:count - 1]
+        while len(handles) < count:
+            driver.switch_to.new_window("tab")
+            handles.append(driver.current_window_handle)
+        # CdpDriver 切换标签页时会自动重放会话设置
+        from utils.cdp_driver import CdpDriver
+
+        if not isinstance(driver, CdpDriver):
+            for handle in handles:
+                if handle != configured:
+                    driver.switch_to.window(handle)
+                    self._setup_tab(driver)
+        driver.switch_to.window(handles[0])
+        return handles
+
     def stop_page_loading(self, driver):
         try:
             driver.execute_script("window.stop();")
@@ -158,6 +596,9 @@ class BrowserManager:
 
     def wait_for_element(self, driver, by, value, timeout=10):
         try:
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
+
             element = WebDriverWait(driver, timeout).until(
                 EC.presence_of_element_located((by, value))
             )
@@ -166,6 +607,28 @@ class BrowserManager:
             logger.warning(f"等待元素超时: {value}")
             return None
 
+    def wait_for_login_state(self, driver, timeout=5, settle=1.5, poll=0.25):
+        """等待登录跳转结果：跳到登录页立即返回；否则等 #app 渲染并稳定 settle 秒"""
+        deadline = time.time() + timeout
+        rendered_since = None
+        while time.time() < deadline:
+            try:
+                if "login" in driver.current_url.lower():
+                    return
+                rendered = driver.execute_script(
+                    "var app = document.querySelector('#app');"
+                    "return document.readyState === 'complete' && !!app && app.children.length > 0;"
+                )
+            except Exception:
+                rendered = False
+            if rendered:
+                rendered_since = rendered_since or time.time()
+                if time.time() - rendered_since >= settle:
+                    return
+            else:
+                rendered_since = None
+            time.sleep(poll)
+
     def wait_and_click(self, driver, by, value, timeout=10):
         element = self.wait_for_element(driver, by, value, timeout)
         if element:
@@ -177,8 +640,46 @@ class BrowserManager:
                 return False
         return False
 
+    def get_chrome_binary_path(self):
+        """Chrome 可执行文件路径：优先使用可执行文件缓存，失效时才重新扫描"""
+        with self._binaries_lock:
+            if "chrome" not in self._binaries:
+                manifest = BinaryManifest()
+                entry = manifest.lookup("chrome")
+                if entry is None:
+                    path = get_platform_utils().get_chrome_binary_path()
+                    entry = manifest.record("chrome", path) if path else None
+                self._binaries["chrome"] = entry
+            entry = self._binaries["chrome"]
+        return entry["path"] if entry else None
+
     def _get_chromedriver_path(self):
-        platform_path = platform_utils.get_chromedriver_path()
+        """chromedriver 路径：缓存有效且与 Chrome 主版本一致时直接使用，
+        不再扫描路径，也不调用 webdriver-manager（可能访问网络）"""
+        with self._binaries_lock:
+            if "chromedriver" not in self._binaries:
+                self._binaries["chromedriver"] = self._resolve_chromedriver()
+            entry = self._binaries["chromedriver"]
+        return entry["path"] if entry else None
+
+    def _resolve_chromedriver(self):
+        manifest = BinaryManifest()
+        self.get_chrome_binary_path()
+        chrome_major = BinaryManifest.major_version((self._binaries.get("chrome") or {}).get("version"))
+        entry = manifest.lookup("chromedriver")
+        if entry:
+            driver_major = BinaryManifest.major_version(entry.get("version"))
+            if chrome_major and driver_major and chrome_major != driver_major:
+                logger.info(
+                    f"Chrome 主版本 {chrome_major} 与缓存的 chromedriver {driver_major} 不一致，重新查找"
+                )
+            else:
+                return entry
+        path = self._find_chromedriver_path()
+        return manifest.record("chromedriver", path) if path else None
+
+    def _find_chromedriver_path(self):
+        platform_path = get_platform_utils().get_chromedriver_path()
         if platform_path:
             return platform_path
 
@@ -202,7 +703,7 @@ class BrowserManager:
             if os.path.exists(current_dir_path):
                 return current_dir_path
 
-        platform_config = platform_utils.get_platform_config()
+        platform_config = get_platform_utils().get_platform_config()
         platform_name = platform_config["platform"]
 
         platform_specific_paths = {
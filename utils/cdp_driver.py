@@ -0,0 +1,351 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import select
+import tempfile
+import subprocess
+import urllib.request
+from collections import deque
+from types import SimpleNamespace
+from urllib.parse import quote
+
+try:
+    import websocket
+except ImportError:  # 可选依赖（随 selenium 一起安装），仅 cdp 驱动需要
+    websocket = None
+
+# 新标签页需要重新下发的会话级设置（Selenium 下只作用于当前标签页）
+SESSION_SETUP_COMMANDS = (
+    "Page.addScriptToEvaluateOnNewDocument",
+    "Network.enable",
+    "Network.setBlockedURLs",
+    "Network.setExtraHTTPHeaders",
+    "Network.setUserAgentOverride",
+)
+
+
+class CdpError(Exception):
+    """CDP 命令返回错误，或页面脚本抛出异常"""
+
+
+def _http_json(address, path, method="GET", timeout=5):
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+    request = urllib.request.Request(f"http://{address}{path}", method=method)
+    with opener.open(request, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+class _Target:
+    """一个页面 target 的 websocket 连接；命令同步收发，期间收到的事件先缓存起来"""
+
+    def __init__(self, target_id, ws_url, network_events):
+        self.id = target_id
+        self.ws = websocket.create_connection(ws_url, timeout=30, suppress_origin=True)
+        self.network_events = network_events
+        self.page_events = deque(maxlen=100)
+        self._next_id = 0
+
+    def _dispatch(self, message):
+        method = message.get("method", "")
+        if method.startswith("Network."):
+            self.network_events.append((self.id, {"method": method, "params": message.get("params", {})}))
+        elif method.startswith("Page."):
+            self.page_events.append(method)
+
+    def _recv(self, timeout):
+        self.ws.settimeout(max(timeout, 0.001))
+        try:
+            return json.loads(self.ws.recv())
+        except websocket.WebSocketTimeoutException:
+            return None
+
+    def send(self, method, params=None, timeout=30):
+        self._next_id += 1
+        message_id = self._next_id
+        self.ws.send(json.dumps({"id": message_id, "method": method, "params": params or {}}))
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError(f"CDP 命令超时: {method}")
+            message = self._recv(remaining)
+            if message is None:
+                continue
+            if message.get("id") == message_id:
+                if "error" in message:
+                    raise CdpError(f"{method}: {message['error'].get('message')}")
+                return message.get("result", {})
+            self._dispatch(message)
+
+    def wait_for_event(self, method, timeout):
+        deadline = time.time() + timeout
+        while method not in self.page_events:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            message = self._recv(remaining)
+            if message is not None:
+                self._dispatch(message)
+        return True
+
+    def drain(self):
+        """不阻塞地读完 socket 上已到达的事件"""
+        while select.select([self.ws.sock], [], [], 0)[0]:
+            message = self._recv(0.1)
+            if message is None:
+                break
+            self._dispatch(message)
+
+    def close(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver._activate(handle)
+
+    def new_window(self, type_hint="tab"):
+        self._driver._new_tab()
+
+
+class CdpDriver:
+    """不经过 chromedriver，直接通过 DevTools 协议（websocket）控制 Chrome。
+    实现了爬虫和 DataProcessor 用到的 WebDriver 接口子集：get、execute_script、
+    execute_async_script、execute_cdp_cmd、get_log、get_cookies、add_cookie、
+    title、current_url、page_source、window_handles、switch_to、quit"""
+
+    def __init__(self, address, process=None, profile_dir=None, page_load_strategy="normal"):
+        if websocket is None:
+            raise RuntimeError("cdp 驱动需要安装 websocket-client")
+        self.address = address
+        self.session_id = uuid.uuid4().hex
+        # 与 Selenium 一致地暴露浏览器进程，供看门狗和内存检查使用；连接常驻浏览器时为 None
+        self.service = SimpleNamespace(process=process)
+        self.page_load_strategy = page_load_strategy or "normal"
+        self.page_load_timeout = 30
+        self.script_timeout = 30
+        self.switch_to = _SwitchTo(self)
+        self._profile_dir = profile_dir
+        self._network_events = deque(maxlen=20000)
+        self._setup_commands = []
+        self._targets = {}
+        self._current = None
+
+        pages = [t for t in _http_json(address, "/json/list") if t.get("type") == "page"]
+        if pages:
+            self._current = self._connect(pages[0])
+        else:
+            self._new_tab()
+
+    @staticmethod
+    def is_available():
+        return websocket is not None
+
+    @classmethod
+    def launch(cls, chrome_binary, arguments, page_load_strategy=None, startup_timeout=20):
+        """启动 Chrome 并连接；调试端口由 Chrome 自行选择后从 DevToolsActivePort 读取"""
+        profile_dir = tempfile.mkdtemp(prefix="mpt_cdp_")
+        process = subprocess.Popen(
+            [
+                chrome_binary,
+                *arguments,
+                "--remote-debugging-port=0",
+                f"--user-data-dir={profile_dir}",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "about:blank",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=os.name != "nt",
+        )
+        port_file = os.path.join(profile_dir, "DevToolsActivePort")
+        deadline = time.time() + startup_timeout
+        while time.time() < deadline:
+            if process.poll() is not None:
+                break
+            try:
+                with open(port_file, "r") as f:
+                    port = int(f.readline().strip())
+                _http_json(f"127.0.0.1:{port}", "/json/version", timeout=1)
+                return cls(f"127.0.0.1:{port}", process, profile_dir, page_load_strategy)
+            except (OSError, ValueError):
+                time.sleep(0.2)
+        process.kill()
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise RuntimeError("Chrome 启动后未开放调试端口")
+
+    @classmethod
+    def attach(cls, address, page_load_strategy=None):
+        return cls(address, page_load_strategy=page_load_strategy)
+
+    # ---- 标签页 ----
+
+    def _connect(self, target):
+        connection = _Target(target["id"], target["webSocketDebuggerUrl"], self._network_events)
+        connection.send("Page.enable")
+        for method, params in self._setup_commands:
+            connection.send(method, params)
+        self._targets[target["id"]] = connection
+        return connection
+
+    def _activate(self, handle):
+        if handle not in self._targets:
+            for target in _http_json(self.address, "/json/list"):
+                if target.get("id") == handle:
+                    self._connect(target)
+                    break
+            else:
+                raise CdpError(f"标签页不存在: {handle}")
+        self._current = self._targets[handle]
+
+    def _new_tab(self):
+        target = _http_json(self.address, "/json/new?" + quote("about:blank"), method="PUT")
+        self._current = self._connect(target)
+
+    @property
+    def window_handles(self):
+        return [t["id"] for t in _http_json(self.address, "/json/list") if t.get("type") == "page"]
+
+    @property
+    def current_window_handle(self):
+        return self._current.id
+
+    # ---- WebDriver 接口 ----
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        if cmd in SESSION_SETUP_COMMANDS:
+            self._setup_commands.append((cmd, cmd_args))
+        return self._current.send(cmd, cmd_args, timeout=self.page_load_timeout)
+
+    def _evaluate(self, expression, await_promise, timeout):
+        result = self._current.send(
+            "Runtime.evaluate",
+            {
+                "expression": expression,
+                "returnByValue": True,
+                "awaitPromise": await_promise,
+                "userGesture": True,
+            },
+            timeout=timeout,
+        )
+        details = result.get("exceptionDetails")
+        if details:
+            text = details.get("exception", {}).get("description") or details.get("text")
+            raise CdpError(f"脚本执行出错: {text}")
+        return result.get("result", {}).get("value")
+
+    def execute_script(self, script, *args):
+        expression = f"(function() {{ {script}\n}}).apply(window, {json.dumps(list(args))})"
+        return self._evaluate(expression, False, self.script_timeout)
+
+    def execute_async_script(self, script, *args):
+        """与 Selenium 相同：脚本的最后一个参数是回调，调用它即返回结果"""
+        expression = (
+            "new Promise(function(resolve) {"
+            f" var args = {json.dumps(list(args))}; args.push(resolve);"
+            f" (function() {{ {script}\n}}).apply(window, args); }})"
+        )
+        return self._evaluate(expression, True, self.script_timeout)
+
+    def get(self, url):
+        target = self._current
+        target.page_events.clear()
+        result = target.send("Page.navigate", {"url": url}, timeout=self.page_load_timeout)
+        if result.get("errorText"):
+            raise CdpError(f"页面加载失败: {result['errorText']}")
+        # 没有 loaderId 表示同文档跳转（只改了 hash）
+        if not result.get("loaderId") or self.page_load_strategy == "none":
+            return
+        event = "Page.domContentEventFired" if self.page_load_strategy == "eager" else "Page.loadEventFired"
+        if not target.wait_for_event(event, self.page_load_timeout):
+            raise TimeoutError(f"页面加载超时: {url}")
+
+    @property
+    def title(self):
+        return self.execute_script("return document.title;") or ""
+
+    @property
+    def current_url(self):
+        return self.execute_script("return window.location.href;") or ""
+
+    @property
+    def page_source(self):
+        return self.execute_script("return document.documentElement.outerHTML;") or ""
+
+    def get_log(self, log_type):
+        """只支持 performance 日志，返回与 Selenium 相同的条目格式"""
+        if log_type != "performance":
+            return []
+        for target in self._targets.values():
+            target.drain()
+        entries = []
+        now = int(time.time() * 1000)
+        while self._network_events:
+            target_id, event = self._network_events.popleft()
+            entries.append({
+                "level": "INFO",
+                "timestamp": now,
+                "message": json.dumps({"message": event, "webview": target_id}),
+            })
+        return entries
+
+    def get_cookies(self):
+        cookies = []
+        for cookie in self._current.send("Network.getAllCookies").get("cookies", []):
+            c = {
+                "name": cookie.get("name"),
+                "value": cookie.get("value", ""),
+                "domain": cookie.get("domain"),
+                "path": cookie.get("path", "/"),
+                "secure": bool(cookie.get("secure")),
+                "httpOnly": bool(cookie.get("httpOnly")),
+            }
+            if cookie.get("sameSite"):
+                c["sameSite"] = cookie["sameSite"]
+            if not cookie.get("session") and (cookie.get("expires") or -1) > 0:
+                c["expiry"] = int(cookie["expires"])
+            cookies.append(c)
+        return cookies
+
+    def add_cookie(self, cookie):
+        params = {
+            "name": cookie.get("name"),
+            "value": cookie.get("value", ""),
+            "domain": cookie.get("domain"),
+            "path": cookie.get("path", "/"),
+        }
+        for key in ("secure", "httpOnly", "sameSite"):
+            if cookie.get(key):
+                params[key] = cookie[key]
+        if cookie.get("expiry"):
+            params["expires"] = float(cookie["expiry"])
+        self._current.send("Network.setCookie", params)
+
+    def quit(self):
+        for target in self._targets.values():
+            target.close()
+        self._targets.clear()
+        process = self.service.process
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if self._profile_dir:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
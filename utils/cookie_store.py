@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import pickle
+import threading
+from config.settings import SESSION_CONFIG
+from utils.logger import logger
+
+COOKIE_SCHEMA_VERSION = 1
+
+
+class CookieStore:
+    """结构化的 Cookie 存储（JSON，带 schema 版本），同时记录最近一次确认登录态的时间，
+    用于在本地判断会话是否仍然有效。旧版 cookies.pkl 会自动迁移"""
+
+    _lock = threading.Lock()
+
+    def __init__(self, directory, config=None):
+        self.config = config or SESSION_CONFIG
+        self.path = os.path.join(directory, "cookies.json")
+        self.legacy_path = os.path.join(directory, "cookies.pkl")
+
+    def _empty(self):
+        return {
+            "schema_version": COOKIE_SCHEMA_VERSION,
+            "saved_at": None,
+            "last_authenticated_at": None,
+            "cookies": [],
+        }
+
+    def _should_migrate(self):
+        if not os.path.exists(self.legacy_path):
+            return False
+        if not os.path.exists(self.path):
+            return True
+        # 从其它机器拷贝过来的新 cookies.pkl 优先
+        return os.path.getmtime(self.legacy_path) > os.path.getmtime(self.path)
+
+    def _migrate_legacy(self):
+        try:
+            with open(self.legacy_path, "rb") as f:
+                cookies = pickle.load(f) or []
+        except Exception as e:
+            logger.warning(f"读取旧版 Cookie 文件失败: {e}")
+            return None
+        data = self._empty()
+        data["cookies"] = cookies
+        data["saved_at"] = os.path.getmtime(self.legacy_path)
+        self._write(data)
+        logger.info(f"已将 {self.legacy_path} 迁移为 {self.path}（{len(cookies)} 个 Cookie）")
+        return data
+
+    def load(self):
+        with self._lock:
+            if self._should_migrate():
+                data = self._migrate_legacy()
+                if data is not None:
+                    return data
+            if not os.path.exists(self.path):
+                return self._empty()
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取 Cookie 文件失败: {e}")
+                return self._empty()
+
+        version = data.get("schema_version")
+        if version != COOKIE_SCHEMA_VERSION:
+            logger.warning(f"Cookie 文件版本 {version} 与当前版本 {COOKIE_SCHEMA_VERSION} 不一致，尝试按当前格式读取")
+        merged = self._empty()
+        merged.update(data)
+        return merged
+
+    def _write(self, data):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def cookies(self):
+        return self.load().get("cookies", [])
+
+    def save(self, cookies, authenticated=False):
+        """保存 Cookie；authenticated 为 True 表示刚刚确认过登录态"""
+        data = self.load()
+        now = time.time()
+        data["schema_version"] = COOKIE_SCHEMA_VERSION
+        data["cookies"] = cookies
+        data["saved_at"] = now
+        if authenticated:
+            data["last_authenticated_at"] = now
+        with self._lock:
+            self._write(data)
+        return self.path
+
+    @staticmethod
+    def earliest_expiry(cookies):
+        expiries = [float(c["expiry"]) for c in cookies if c.get("expiry")]
+        return min(expiries) if expiries else None
+
+    def is_session_fresh(self, now=None):
+        """本地判断会话是否可信：最近 login_cache_minutes 内确认过登录，
+        且没有 Cookie 会在 cookie_expiry_margin_minutes 内过期"""
+        data = self.load()
+        now = now or time.time()
+        last_auth = data.get("last_authenticated_at")
+        if not data.get("cookies") or not last_auth:
+            return False
+        if now - last_auth > float(self.config.get("login_cache_minutes", 360)) * 60:
+            return False
+        earliest = self.earliest_expiry(data["cookies"])
+        margin = float(self.config.get("cookie_expiry_margin_minutes", 10)) * 60
+        return earliest is None or earliest - now > margin
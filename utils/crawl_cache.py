@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from config.settings import CACHE_CONFIG, FILE_PATHS
+from utils.logger import logger
+
+
+class CrawlCache:
+    """按 (服务器, 角色名) 持久化上次抓取结果，用于跳过长期无变化的角色"""
+
+    def __init__(self, path=None, config=None):
+        self.config = config or CACHE_CONFIG
+        self.path = path or FILE_PATHS["crawl_cache"]
+        self.ttl = float(self.config.get("ttl_hours", 72)) * 3600
+        self.idle_after = float(self.config.get("idle_after_days", 7)) * 86400
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取抓取缓存失败，将重新建立: {e}")
+            return {}
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def key(server, name):
+        return f"{server}|{name}"
+
+    @staticmethod
+    def content_hash(records):
+        rows = sorted(json.dumps(record, ensure_ascii=False, sort_keys=True) for record in records)
+        return hashlib.sha1("\n".join(rows).encode("utf-8")).hexdigest()
+
+    def get(self, server, name):
+        return self.entries.get(self.key(server, name))
+
+    def update(self, server, name, records, now=None):
+        """记录一次成功抓取，返回数据是否发生变化"""
+        now = now or time.time()
+        digest = self.content_hash(records)
+        with self._lock:
+            entry = self.entries.get(self.key(server, name))
+            changed = entry is None or entry.get("hash") != digest
+            self.entries[self.key(server, name)] = {
+                "records": records,
+                "hash": digest,
+                "crawled_at": now,
+                "changed_at": now if changed else entry.get("changed_at", now),
+            }
+        return changed
+
+    def is_idle(self, server, name, now=None):
+        """数据超过 idle_after_days 没有变化"""
+        entry = self.get(server, name)
+        if not entry:
+            return False
+        now = now or time.time()
+        return now - entry.get("changed_at", 0) >= self.idle_after
+
+    def is_fresh(self, server, name, now=None):
+        """长期无变化且距上次抓取不足 ttl_hours，可直接复用缓存"""
+        entry = self.get(server, name)
+        if not entry:
+            return False
+        now = now or time.time()
+        return self.is_idle(server, name, now) and now - entry.get("crawled_at", 0) < self.ttl
+
+    def cached_records(self, server, name):
+        entry = self.get(server, name) or {}
+        return [dict(record) for record in entry.get("records", [])]
@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from config.settings import FILE_PATHS
+from utils.logger import logger
+
+
+class CrawlJournal:
+    """逐个角色追加写入的抓取日志（JSONL），进程中断后可按 run id 续跑"""
+
+    def __init__(self, run_id=None, directory=None):
+        self.directory = directory or FILE_PATHS["journal_dir"]
+        os.makedirs(self.directory, exist_ok=True)
+        self.run_id = run_id or self._create_run()
+        self.path = os.path.join(self.directory, f"{self.run_id}.jsonl")
+        self._lock = threading.Lock()
+        self._tail_checked = False
+
+    def _create_run(self):
+        """新运行独占创建日志文件；同一秒内已有运行时加序号，避免把它当作续跑"""
+        base = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = 0
+        while True:
+            run_id = base if suffix == 0 else f"{base}_{suffix}"
+            path = os.path.join(self.directory, f"{run_id}.jsonl")
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                suffix += 1
+                continue
+            os.close(fd)
+            return run_id
+
+    @staticmethod
+    def key(server, name):
+        return f"{server}|{name}"
+
+    @classmethod
+    def latest_unfinished(cls, directory=None):
+        """返回最近一次未完成运行的 run id，没有则返回 None"""
+        directory = directory or FILE_PATHS["journal_dir"]
+        if not os.path.isdir(directory):
+            return None
+        run_ids = sorted(
+            (name[:-len(".jsonl")] for name in os.listdir(directory) if name.endswith(".jsonl")),
+            reverse=True,
+        )
+        for run_id in run_ids:
+            if not cls(run_id, directory).is_complete():
+                return run_id
+        return None
+
+    def _read_events(self):
+        if not os.path.exists(self.path):
+            return []
+        events = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    # 崩溃时最后一行可能只写了一半
+                    continue
+        return events
+
+    def is_complete(self):
+        return any(event.get("event") == "complete" for event in self._read_events())
+
+    def load_completed(self):
+        """返回本次运行已完成角色的结果 {key: records}"""
+        completed = {}
+        for event in self._read_events():
+            if event.get("event") == "result":
+                completed[self.key(event["server"], event["name"])] = event.get("records", [])
+        return completed
+
+    def _needs_newline(self):
+        """上次崩溃可能留下没有换行的半行，续写前先补上换行"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def _append(self, event):
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            if not self._tail_checked:
+                if self._needs_newline():
+                    line = "\n" + line
+                self._tail_checked = True
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def append(self, server, name, records):
+        self._append({
+            "event": "result",
+            "server": server,
+            "name": name,
+            "records": records,
+            "ts": time.time(),
+        })
+
+    def mark_complete(self):
+        self._append({"event": "complete", "ts": time.time()})
+
+    def prune(self, keep=10):
+        """只保留最近 keep 个日志文件"""
+        files = sorted(name for name in os.listdir(self.directory) if name.endswith(".jsonl"))
+        for name in files[:-keep] if keep > 0 else []:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError as e:
+                logger.debug(f"删除旧抓取日志失败 {name}: {e}")
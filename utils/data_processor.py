@@ -1,18 +1,14 @@
 import pandas as pd
-import re
 import json
 import time
-from urllib.parse import quote
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from urllib.parse import quote, unquote, urlparse, parse_qs
 from config.settings import (
-    DUNGEON_NAME_MAP, DUNGEON_TIME_LIMIT,
     BLIZZARD_BASE_URL, BLIZZARD_API_BASE,
     SERVER_SLUG_MAP
 )
 from utils.logger import logger
+from utils.dungeon_matcher import get_dungeon_matcher, LEVEL_PATTERN, TIME_PATTERN
+from utils.run_record import RunRecord
 
 
 class DataProcessor:
@@ -36,42 +32,94 @@ class DataProcessor:
         return quote(server_name, safe="")
 
     @staticmethod
-    def build_character_url(server_name, character_name):
+    def build_character_hash(server_name, character_name):
         slug = DataProcessor.get_server_slug(server_name)
         encoded_name = quote(character_name.strip(), safe="")
-        return f"{BLIZZARD_BASE_URL}#/{slug}/{encoded_name}?q={encoded_name}"
+        return f"#/{slug}/{encoded_name}?q={encoded_name}"
 
     @staticmethod
-    def wait_for_mytable_data(driver, timeout=15):
-        wait = WebDriverWait(driver, timeout)
-        logger.info("等待页面加载 M+ 数据...")
+    def build_character_url(server_name, character_name):
+        return f"{BLIZZARD_BASE_URL}{DataProcessor.build_character_hash(server_name, character_name)}"
 
-        selectors = [
-            ".mythic-keystone", ".MythicKeystone", "[class*='mythic']",
-            "[class*='keystone']", ".dungeon-run", ".MythicKeystoneDungeonRun",
-            ".stone-slide", "[class*='dungeon']",
-            ".el-table", ".el-table__body",
-            ".pve-content", "[class*='pve']",
-            ".role-info", ".character-info",
-        ]
+    @staticmethod
+    def build_api_url(server_name, character_name, endpoint="/do"):
+        slug = DataProcessor.get_server_slug(server_name)
+        return DataProcessor.build_api_url_for_slug(slug, character_name, endpoint)
 
-        for selector in selectors:
-            try:
-                element = wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                logger.info(f"找到元素: {selector}")
-                return selector
-            except TimeoutException:
-                continue
+    @staticmethod
+    def build_api_url_for_slug(realm_slug, role_name, endpoint="/do"):
+        encoded_name = quote(role_name.strip(), safe="")
+        return f"{BLIZZARD_API_BASE}{endpoint}?realmSlug={realm_slug}&roleName={encoded_name}"
 
-        logger.warning("未找到已知的M+数据元素")
-        return None
+    @staticmethod
+    def api_url_matches(url, realm_slug, role_name):
+        """API 地址是否是查询该角色的请求。hash 导航不会取消上一个角色尚未完成的请求，
+        晚到的响应需要按 realmSlug / roleName 排除"""
+        query = parse_qs(urlparse(url).query)
+        return (
+            query.get("realmSlug", [None])[0] == unquote(realm_slug)
+            and query.get("roleName", [None])[0] == role_name.strip()
+        )
 
     @staticmethod
-    def extract_json_from_attrs(driver):
+    def extract_records_from_api_payload(payload):
+        """解析 armory API 返回的 JSON，兼容 {code, data: {...}} 包装"""
+        data = payload
+        while isinstance(data, dict) and isinstance(data.get("data"), (dict, list)):
+            data = data["data"]
+        records = DataProcessor._extract_from_state(data)
+        if not records:
+            records = DataProcessor._normalize_mplus_data(data)
+        return records
+
+    @staticmethod
+    def extract_mplus_from_network(payloads):
+        """解析浏览器捕获到的 API 响应 [(url, json)]"""
         records = []
-        js_code = """
+        seen = set()
+        for url, payload in payloads:
+            for record in DataProcessor.extract_records_from_api_payload(payload):
+                key = (record["副本"], record["限时层数"], record["通关时间"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                records.append(record)
+        return records
+
+    # hash 路由切换前记录上一个角色的内容，就绪判断据此排除尚未刷新的旧数据；
+    # 整页加载后这些变量不存在，不影响判断
+    MARK_STALE_JS = """
+    var slides = document.querySelectorAll('.stone-slide');
+    window.__mptPrevSlides = Array.prototype.map.call(slides, function(s) { return s.innerText; }).join('|');
+    window.__mptPrevTitle = document.title;
+    """
+
+    MPLUS_READY_JS = """
+    var slides = document.querySelectorAll('.stone-slide');
+    if (slides.length) {
+        var signature = Array.prototype.map.call(slides, function(s) { return s.innerText; }).join('|');
+        if (signature !== window.__mptPrevSlides) { return 'stone-slide'; }
+    }
+    var title = document.title || '';
+    if (title !== window.__mptPrevTitle && title.indexOf('0 层') !== -1) { return 'empty'; }
+    return null;
+    """
+
+    @staticmethod
+    def wait_for_mytable_data(driver, timeout=15, poll_frequency=0.2):
+        """等待 M+ 数据渲染完成：出现 .stone-slide 返回 'stone-slide'，
+        标题出现 "0 层" 返回 'empty'，超时返回 None"""
+        # 直接轮询而不用 WebDriverWait，selenium 与 cdp 驱动都适用，也不必导入 selenium
+        deadline = time.time() + timeout
+        while True:
+            marker = driver.execute_script(DataProcessor.MPLUS_READY_JS)
+            if marker:
+                return marker
+            if time.time() >= deadline:
+                return None
+            time.sleep(poll_frequency)
+
+    ATTRS_JS = """
         var results = [];
         var patterns = ['mythic_keystone', 'mythicRating', 'mythic_rating', 'dungeonData', 'dungeon_data'];
         for (var i = 0; i < patterns.length; i++) {
@@ -82,23 +130,9 @@ class DataProcessor:
             }
         }
         return results;
-        """
-        try:
-            raw = driver.execute_script(js_code)
-            for item in raw:
-                try:
-                    data = json.loads(item)
-                    records.extend(DataProcessor._normalize_mplus_data(data))
-                except (json.JSONDecodeError, TypeError):
-                    continue
-        except Exception as e:
-            logger.debug(f"从 data-attr 提取数据失败: {e}")
-        return records
+    """
 
-    @staticmethod
-    def extract_vuex_data(driver):
-        records = []
-        js_code = """
+    VUEX_JS = """
         try {
             var app = document.querySelector('#app');
             if (app && app.__vue_app__) {
@@ -113,16 +147,41 @@ class DataProcessor:
             }
         } catch(e) {}
         return null;
-        """
+    """
+
+    @staticmethod
+    def extract_json_from_attrs(driver):
         try:
-            state_json = driver.execute_script(js_code)
-            if state_json:
-                state = json.loads(state_json)
-                records.extend(DataProcessor._extract_from_state(state))
+            return DataProcessor._records_from_json_strings(driver.execute_script(DataProcessor.ATTRS_JS))
         except Exception as e:
-            logger.debug(f"从 Vuex store 提取数据失败: {e}")
+            logger.debug(f"从 data-attr 提取数据失败: {e}")
+            return []
+
+    @staticmethod
+    def _records_from_json_strings(raw):
+        records = []
+        for item in raw or []:
+            try:
+                data = json.loads(item)
+                records.extend(DataProcessor._normalize_mplus_data(data))
+            except (json.JSONDecodeError, TypeError):
+                continue
         return records
 
+    @staticmethod
+    def extract_vuex_data(driver):
+        try:
+            return DataProcessor._records_from_state_json(driver.execute_script(DataProcessor.VUEX_JS))
+        except Exception as e:
+            logger.debug(f"从 Vuex store 提取数据失败: {e}")
+            return []
+
+    @staticmethod
+    def _records_from_state_json(state_json):
+        if not state_json:
+            return []
+        return DataProcessor._extract_from_state(json.loads(state_json))
+
     @staticmethod
     def _extract_from_state(state):
         records = []
@@ -163,88 +222,53 @@ class DataProcessor:
 
         dungeon_raw = (run.get("dungeon") or {}).get("name",
                        run.get("dungeon_name", run.get("name", "")))
-        dungeon = DUNGEON_NAME_MAP.get(dungeon_raw, dungeon_raw)
+        dungeon = get_dungeon_matcher().canonical(dungeon_raw)
 
         level = run.get("keystone_level", run.get("level",
                         run.get("mythic_level", run.get("plus_level"))))
 
-        time_str = run.get("clear_time", run.get("time",
+        time_value = run.get("clear_time", run.get("time",
                         run.get("run_time", run.get("duration", ""))))
-        if isinstance(time_str, (int, float)):
-            minutes = int(time_str // 60)
-            seconds = int(time_str % 60)
-            time_str = f"{minutes:02d}:{seconds:02d}"
-        elif isinstance(time_str, str) and not re.match(r"\d{1,2}:\d{2}", time_str):
-            time_seconds = run.get("clear_time_ms", 0) or run.get("duration_ms", 0) or 0
-            if time_seconds > 0:
-                time_seconds = time_seconds / 1000 if time_seconds > 10000 else time_seconds
-                minutes = int(time_seconds / 60)
-                seconds = int(time_seconds % 60)
-                time_str = f"{minutes:02d}:{seconds:02d}"
-
-        if not re.match(r"\d{1,2}:\d{2}", str(time_str)):
-            time_str = None
-
-        if time_str and dungeon:
-            t_split = time_str.split(":")
-            run_seconds = int(t_split[0]) * 60 + int(t_split[1]) if len(t_split) == 2 else 9999
-            limit = DUNGEON_TIME_LIMIT.get(dungeon)
-            on_time = (limit is not None and run_seconds <= limit)
-            result = "是" if on_time else "否"
-
-            level_str = run.get("keystone_level", run.get("level",
-                              run.get("mythic_level", run.get("plus_level"))))
-            try:
-                level_int = int(level_str) if level_str is not None else None
-            except (ValueError, TypeError):
-                level_int = None
-
-            return {
-                "副本": dungeon,
-                "限时层数": level_int,
-                "通关时间": time_str,
-                "是否限时": result,
-            }
-
-        return None
+        time_match = TIME_PATTERN.match(time_value) if isinstance(time_value, str) else None
+        seconds = None
+        if isinstance(time_value, (int, float)):
+            seconds = int(time_value)
+        elif time_match:
+            seconds = RunRecord.parse_time(time_match.group(0))
+        else:
+            duration = run.get("clear_time_ms", 0) or run.get("duration_ms", 0) or 0
+            if duration > 0:
+                seconds = int(duration / 1000 if duration > 10000 else duration)
+
+        if seconds is None or not dungeon:
+            return None
+        return RunRecord.build(dungeon, level, seconds).to_dict()
 
     @staticmethod
     def parse_dungeon_data(row_soup, dungeon_name_map=None):
-        if dungeon_name_map is None:
-            dungeon_name_map = DUNGEON_NAME_MAP
         try:
             a_tag = row_soup.find("a", class_="Boss zone-boss-cell")
             if not a_tag:
                 return None
             raw_dungeon = a_tag.text.strip()
-            dungeon = dungeon_name_map.get(raw_dungeon, raw_dungeon)
+            if dungeon_name_map is None:
+                dungeon = get_dungeon_matcher().canonical(raw_dungeon)
+            else:
+                dungeon = dungeon_name_map.get(raw_dungeon, raw_dungeon)
             time_cells = row_soup.find_all("td", class_="verbose main-table-number kills-cell")
             if len(time_cells) < 2:
                 return None
             time_text = time_cells[1].get_text(strip=True)
-            time_match = re.search(r"\d{1,2}:\d{2}", time_text)
-            time_str = time_match.group(0) if time_match else "未知"
-            level_match = re.search(r"\+(\d+)", time_text)
+            time_match = TIME_PATTERN.search(time_text)
+            seconds = RunRecord.parse_time(time_match.group(0)) if time_match else None
+            level_match = LEVEL_PATTERN.search(time_text)
             plus_level = int(level_match.group(1)) if level_match else None
-            t_split = time_str.split(":")
-            run_seconds = int(t_split[0]) * 60 + int(t_split[1]) if len(t_split) == 2 else 9999
-            limit = DUNGEON_TIME_LIMIT.get(dungeon)
-            on_time = (limit is not None and run_seconds <= limit)
-            result = "是" if on_time else "否"
-            return {
-                "副本": dungeon,
-                "限时层数": plus_level,
-                "通关时间": time_str,
-                "是否限时": result,
-            }
+            return RunRecord.build(dungeon, plus_level, seconds).to_dict()
         except Exception as e:
             logger.error(f"解析副本行失败: {e}")
             return None
 
-    @staticmethod
-    def extract_mplus_from_dom(driver):
-        records = []
-        js_code = """
+    DOM_SLIDES_JS = """
         var results = [];
         var slides = document.querySelectorAll('.stone-slide');
         slides.forEach(function(slide) {
@@ -259,110 +283,143 @@ class DataProcessor:
             }
         });
         return results;
-        """
-        try:
-            raw_data = driver.execute_script(js_code)
-            seen = set()
-            for item in raw_data:
-                key = (item["dungeon"], item["level"])
-                if key in seen:
-                    continue
-                seen.add(key)
+    """
 
-                dungeon = item["dungeon"]
-                time_str = item["time"]
-                level_str = item["level"]
-
-                if not re.match(r"\d{1,2}:\d{2}", time_str):
-                    continue
-
-                try:
-                    level_int = int(level_str)
-                except (ValueError, TypeError):
-                    continue
-
-                records.append({
-                    "副本": dungeon,
-                    "限时层数": level_int,
-                    "通关时间": time_str,
-                    "是否限时": "是",
-                })
+    PAGE_TEXT_JS = """
+        var bodyText = document.body.innerText || '';
+        var lines = bodyText.split('\\n').filter(function(l) { return l.trim(); });
+        return lines.slice(0, 500);
+    """
 
+    @staticmethod
+    def extract_mplus_from_dom(driver):
+        try:
+            records = DataProcessor._records_from_slides(driver.execute_script(DataProcessor.DOM_SLIDES_JS))
             if records:
                 logger.info(f"从 DOM 结构提取到 {len(records)} 条大秘境记录")
             return records
         except Exception as e:
             logger.debug(f"DOM 提取失败: {e}")
-            return records
+            return []
 
     @staticmethod
-    def extract_mplus_from_page_text(driver):
+    def _records_from_slides(raw_data):
         records = []
-        js_code = """
-        var bodyText = document.body.innerText || '';
-        var lines = bodyText.split('\\n').filter(function(l) { return l.trim(); });
-        return lines.slice(0, 500);
-        """
+        seen = set()
+        for item in raw_data or []:
+            key = (item["dungeon"], item["level"])
+            if key in seen:
+                continue
+            seen.add(key)
+
+            dungeon = item["dungeon"]
+            time_str = item["time"]
+            level_str = item["level"]
+
+            time_match = TIME_PATTERN.match(time_str)
+            if not time_match:
+                continue
+
+            try:
+                level_int = int(level_str)
+            except (ValueError, TypeError):
+                continue
+
+            records.append(RunRecord.build(dungeon, level_int, RunRecord.parse_time(time_match.group(0)), timed=True).to_dict())
+        return records
+
+    @staticmethod
+    def extract_mplus_from_page_text(driver):
         try:
-            lines = driver.execute_script(js_code)
-            dungeon_names_cn = list(DUNGEON_NAME_MAP.values())
-            dungeon_names_en = list(DUNGEON_NAME_MAP.keys())
-            all_dungeon_names = dungeon_names_cn + dungeon_names_en
-
-            current_dungeon = None
-            for line in lines:
-                line = line.strip()
-                for dn in all_dungeon_names:
-                    if dn in line or (DUNGEON_NAME_MAP.get(dn) and DUNGEON_NAME_MAP[dn] in line):
-                        dungeon_key = dn if dn in DUNGEON_NAME_MAP else (
-                            next((k for k, v in DUNGEON_NAME_MAP.items() if v == dn), dn))
-                        current_dungeon = DUNGEON_NAME_MAP.get(dungeon_key, dungeon_key)
-                        break
-
-                if current_dungeon:
-                    level_match = re.search(r"[+](\d+)", line)
-                    time_match = re.search(r"(\d{1,2}:\d{2})", line)
-                    if level_match and time_match:
-                        try:
-                            level = int(level_match.group(1))
-                            time_str = time_match.group(1)
-                            t_split = time_str.split(":")
-                            run_seconds = int(t_split[0]) * 60 + int(t_split[1])
-                            limit = DUNGEON_TIME_LIMIT.get(current_dungeon)
-                            on_time = (limit is not None and run_seconds <= limit)
-                            result = "是" if on_time else "否"
-                            records.append({
-                                "副本": current_dungeon,
-                                "限时层数": level,
-                                "通关时间": time_str,
-                                "是否限时": result,
-                            })
-                            current_dungeon = None
-                        except (ValueError, IndexError):
-                            pass
+            return DataProcessor._records_from_text_lines(driver.execute_script(DataProcessor.PAGE_TEXT_JS))
         except Exception as e:
             logger.debug(f"从页面文本提取数据失败: {e}")
-        return records
+            return []
 
     @staticmethod
-    def extract_mplus_via_api_call(driver, realm_slug, role_name):
+    def _page_text_dungeon_names():
+        return get_dungeon_matcher().aliases
+
+    @staticmethod
+    def _records_from_text_lines(lines):
         records = []
-        script = f"""
-        var xhr = new XMLHttpRequest();
-        xhr.open('GET', '{BLIZZARD_API_BASE}/do?realmSlug={realm_slug}&roleName={quote(role_name)}', false);
-        xhr.withCredentials = true;
-        xhr.send();
-        return xhr.responseText;
-        """
+        matcher = get_dungeon_matcher()
+
+        current_dungeon = None
+        for line in lines or []:
+            line = line.strip()
+            current_dungeon = matcher.search(line) or current_dungeon
+
+            if current_dungeon:
+                level_match = LEVEL_PATTERN.search(line)
+                time_match = TIME_PATTERN.search(line)
+                if level_match and time_match:
+                    seconds = RunRecord.parse_time(time_match.group(0))
+                    records.append(RunRecord.build(current_dungeon, int(level_match.group(1)), seconds).to_dict())
+                    current_dungeon = None
+        return records
+
+    # 在已登录页面内用 fetch 并发请求多个 API 地址，同时在途的请求不超过 limit 个
+    BATCH_FETCH_JS = """
+    var urls = arguments[0];
+    var limit = Math.max(1, arguments[1] || 1);
+    var done = arguments[arguments.length - 1];
+    var results = new Array(urls.length);
+    var next = 0;
+    function worker() {
+        if (next >= urls.length) { return Promise.resolve(); }
+        var i = next++;
+        return fetch(urls[i], {credentials: 'include', headers: {'Accept': 'application/json'}})
+            .then(function(r) {
+                return r.text().then(function(text) { results[i] = {status: r.status, body: text}; });
+            })
+            .catch(function(e) { results[i] = {status: 0, error: String(e)}; })
+            .then(worker);
+    }
+    var workers = [];
+    for (var w = 0; w < Math.min(limit, urls.length); w++) { workers.push(worker()); }
+    Promise.all(workers).then(function() { done(results); });
+    """
+
+    @staticmethod
+    def fetch_api_batch(driver, pairs, concurrency=4, endpoint="/do"):
+        """pairs 为 [(realm_slug, role_name)]，一次 execute_async_script 取回全部 JSON，
+        结果与输入顺序一致，失败项为 None"""
+        urls = [DataProcessor.build_api_url_for_slug(slug, name, endpoint) for slug, name in pairs]
+        if not urls:
+            return []
         try:
-            time.sleep(1)
-            result = driver.execute_script(script)
-            if result:
-                data = json.loads(result)
-                logger.info(f"API /do 响应: {json.dumps(data, ensure_ascii=False)[:500]}")
+            responses = driver.execute_async_script(DataProcessor.BATCH_FETCH_JS, urls, concurrency)
         except Exception as e:
-            logger.debug(f"API 调用失败: {e}")
-        return records
+            logger.warning(f"页面内批量请求失败: {e}")
+            return [None] * len(urls)
+
+        payloads = []
+        for url, response in zip(urls, responses or [None] * len(urls)):
+            if not response or response.get("status") != 200:
+                status = (response or {}).get("status")
+                logger.debug(f"页面内请求失败 ({status}): {url} {(response or {}).get('error', '')}")
+                payloads.append(None)
+                continue
+            try:
+                payloads.append(json.loads(response.get("body") or ""))
+            except ValueError:
+                logger.debug(f"页面内请求响应不是 JSON: {url}")
+                payloads.append(None)
+        return payloads
+
+    @staticmethod
+    def extract_mplus_batch(driver, pairs, concurrency=4, endpoint="/do"):
+        """批量抓取多个角色，返回与 pairs 对应的记录列表，失败或无数据为 None"""
+        results = []
+        for payload in DataProcessor.fetch_api_batch(driver, pairs, concurrency, endpoint):
+            records = DataProcessor.extract_records_from_api_payload(payload) if payload is not None else []
+            results.append(records or None)
+        return results
+
+    @staticmethod
+    def extract_mplus_via_api_call(driver, realm_slug, role_name):
+        return DataProcessor.extract_mplus_batch(driver, [(realm_slug, role_name)])[0] or []
 
     @staticmethod
     def format_display_level(row):
@@ -414,25 +471,92 @@ class DataProcessor:
             logger.info("已将职业名称中的'潜行者'统一替换为'盗贼'")
         return char_df
 
+    VUE_DATA_JS = """
+        try {
+            var el = document.querySelector('#app');
+            if (!el) return null;
+            var vm = el.__vue__ || el.__vue_app__;
+            if (!vm) return null;
+            var data = {};
+            if (vm.$data) Object.assign(data, vm.$data);
+            if (vm.setupState) Object.assign(data, vm.setupState);
+            return JSON.stringify(data);
+        } catch(e) { return null; }
+    """
+
     @staticmethod
     def extract_window_data_vue(driver):
-        records = []
         try:
-            vue_data = driver.execute_script("""
-            try {
-                var el = document.querySelector('#app');
-                if (!el) return null;
-                var vm = el.__vue__ || el.__vue_app__;
-                if (!vm) return null;
-                var data = {};
-                if (vm.$data) Object.assign(data, vm.$data);
-                if (vm.setupState) Object.assign(data, vm.setupState);
-                return JSON.stringify(data);
-            } catch(e) { return null; }
-            """)
-            if vue_data:
-                data = json.loads(vue_data)
-                records.extend(DataProcessor._normalize_mplus_data(data))
+            return DataProcessor._records_from_data_json(driver.execute_script(DataProcessor.VUE_DATA_JS))
         except Exception as e:
             logger.debug(f"Vue data 提取失败: {e}")
-        return records
+            return []
+
+    @staticmethod
+    def _records_from_data_json(data_json):
+        if not data_json:
+            return []
+        return DataProcessor._normalize_mplus_data(json.loads(data_json))
+
+    # 在浏览器内运行全部提取策略，按优先级回传所有候选数据，只需一次 WebDriver 往返；
+    # 由 Python 依次解析，采用第一个解析出记录的策略。
+    # 页面文本只保留含副本名或同时含 +层数 与 mm:ss 的行，其余行不影响解析结果
+    COMBINED_EXTRACTOR_JS = (
+        """
+        var dungeonNames = arguments[0] || [];
+        function run(fn) { try { return fn(); } catch (e) { return null; } }
+        var candidates = [];
+        var slides = run(function() {""" + DOM_SLIDES_JS + """});
+        if (slides && slides.length) { candidates.push({strategy: 'dom', payload: slides}); }
+
+        var lines = run(function() {""" + PAGE_TEXT_JS + """}) || [];
+        var kept = lines.filter(function(line) {
+            if (/[+]\\d+/.test(line) && /\\d{1,2}:\\d{2}/.test(line)) { return true; }
+            for (var i = 0; i < dungeonNames.length; i++) {
+                if (line.indexOf(dungeonNames[i]) !== -1) { return true; }
+            }
+            return false;
+        });
+        if (kept.length) { candidates.push({strategy: 'text', payload: kept}); }
+
+        var vue = run(function() {""" + VUE_DATA_JS + """});
+        if (vue) { candidates.push({strategy: 'vue', payload: vue}); }
+        var attrs = run(function() {""" + ATTRS_JS + """});
+        if (attrs && attrs.length) { candidates.push({strategy: 'attrs', payload: attrs}); }
+        var vuex = run(function() {""" + VUEX_JS + """});
+        if (vuex) { candidates.push({strategy: 'vuex', payload: vuex}); }
+        return candidates;
+        """
+    )
+
+    @staticmethod
+    def extract_mplus_combined(driver):
+        """一次 execute_script 运行全部提取策略，返回 (命中的策略, 记录列表)"""
+        parsers = {
+            "dom": DataProcessor._records_from_slides,
+            "text": DataProcessor._records_from_text_lines,
+            "vue": DataProcessor._records_from_data_json,
+            "attrs": DataProcessor._records_from_json_strings,
+            "vuex": DataProcessor._records_from_state_json,
+        }
+        try:
+            candidates = driver.execute_script(
+                DataProcessor.COMBINED_EXTRACTOR_JS, DataProcessor._page_text_dungeon_names()
+            ) or []
+        except Exception as e:
+            logger.debug(f"组合提取脚本执行失败: {e}")
+            return None, []
+
+        for candidate in candidates:
+            strategy = candidate.get("strategy")
+            parser = parsers.get(strategy)
+            if not parser:
+                continue
+            try:
+                records = parser(candidate.get("payload"))
+            except (ValueError, TypeError, KeyError) as e:
+                logger.debug(f"解析 {strategy} 提取结果失败: {e}")
+                continue
+            if records:
+                return strategy, records
+        return None, []
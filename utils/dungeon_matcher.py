@@ -0,0 +1,53 @@
+import re
+from config.settings import DUNGEON_NAME_MAP, DUNGEON_TIME_LIMIT, DUNGEON_SHORT_NAME_MAP
+
+# 页面文本与接口数据中的层数（+12）和通关时间（mm:ss，超过 99 分钟时分钟为三位）
+LEVEL_PATTERN = re.compile(r"[+](\d+)")
+TIME_PATTERN = re.compile(r"(?<!\d)\d+:\d{2}(?!\d)")
+
+
+class DungeonMatcher:
+    """副本名匹配器：把英文名、中文名和简称统一映射到中文副本名。
+    所有别名编译成一个正则（长的在前），每行文本只需扫描一次，与副本/别名数量无关"""
+
+    def __init__(self, name_map=None, time_limits=None, short_names=None):
+        name_map = DUNGEON_NAME_MAP if name_map is None else name_map
+        time_limits = DUNGEON_TIME_LIMIT if time_limits is None else time_limits
+        short_names = DUNGEON_SHORT_NAME_MAP if short_names is None else short_names
+
+        index = {}
+        for name in list(time_limits) + list(short_names) + list(name_map.values()):
+            index.setdefault(name, name)
+        for english, chinese in name_map.items():
+            index.setdefault(english, chinese)
+        for name, short in short_names.items():
+            index.setdefault(short, name)
+        self.index = {alias: name for alias, name in index.items() if alias}
+
+        # 长别名优先，避免简称抢先匹配到完整名称的一部分
+        self.aliases = sorted(self.index, key=len, reverse=True)
+        self.pattern = (
+            re.compile("|".join(re.escape(alias) for alias in self.aliases)) if self.aliases else None
+        )
+
+    def canonical(self, name):
+        """别名换成中文副本名，不认识的名称原样返回"""
+        return self.index.get(name, name)
+
+    def search(self, text):
+        """返回文本中出现的第一个副本（中文名），没有则返回 None"""
+        if self.pattern is None or not text:
+            return None
+        match = self.pattern.search(text)
+        return self.index[match.group(0)] if match else None
+
+
+_dungeon_matcher = None
+
+
+def get_dungeon_matcher():
+    """获取共享的 DungeonMatcher 实例"""
+    global _dungeon_matcher
+    if _dungeon_matcher is None:
+        _dungeon_matcher = DungeonMatcher()
+    return _dungeon_matcher
@@ -3,9 +3,9 @@ import numpy as np
 import json
 from datetime import datetime
 import traceback
-from openpyxl import load_workbook
 from config.settings import CLASS_COLOR_MAP, LAYER_COLOR_MAP, DUNGEON_NAME_MAP, DUNGEON_TIME_LIMIT, DUNGEON_COLOR_MAP, DUNGEON_SHORT_NAME_MAP
 from utils.logger import logger
+from utils.run_record import RunRecord
 
 class HTMLVisualizer:
     def __init__(self):
@@ -141,6 +141,8 @@ class HTMLVisualizer:
             except Exception as e2:
                 logger.warning(f"pandas+openpyxl仍失败，降级openpyxl逐行读取: {e2}")
                 # 使用 openpyxl 读取
+                from openpyxl import load_workbook
+
                 wb = load_workbook(filename=file_path, data_only=True, read_only=True)
                 sheet = None
                 if preferred_sheet and preferred_sheet in wb.sheetnames:
@@ -593,14 +595,7 @@ class HTMLVisualizer:
     
     def _time_to_seconds(self, time_series):
         """将时间字符串转换为秒数"""
-        seconds = []
-        for time_str in time_series:
-            try:
-                parts = time_str.split(":")
-                seconds.append(int(parts[0]) * 60 + int(parts[1]))
-            except:
-                seconds.append(0)
-        return pd.Series(seconds)
+        return pd.Series([RunRecord.parse_time(time_str) or 0 for time_str in time_series])
     
     def _seconds_to_time_format(self, seconds):
         """将秒数转换为时间格式"""
@@ -1229,14 +1224,7 @@ class HTMLVisualizer:
     
     def _time_to_seconds(self, time_series):
         """将时间字符串转换为秒数"""
-        seconds = []
-        for time_str in time_series:
-            try:
-                parts = time_str.split(":")
-                seconds.append(int(parts[0]) * 60 + int(parts[1]))
-            except:
-                seconds.append(0)
-        return pd.Series(seconds)
+        return pd.Series([RunRecord.parse_time(time_str) or 0 for time_str in time_series])
     
     def _seconds_to_time_format(self, seconds):
         """将秒数转换为时间格式"""
@@ -48,6 +48,10 @@ class Logger:
         """记录一般信息"""
         self.log(f"[INFO] {message}")
 
+    def debug(self, message):
+        """记录调试信息"""
+        self.log(f"[DEBUG] {message}")
+
     def save_to_file(self):
         """将日志保存到文件 / Save log to file"""
         try:
@@ -0,0 +1,83 @@
+import threading
+from collections import deque
+from config.settings import CRAWLER_CONFIG
+
+
+class PageLoadTracker:
+    """记录角色页面实际就绪耗时，并按观测到的 p95 自动调整等待上限"""
+
+    def __init__(self, config=None):
+        self.config = config or CRAWLER_CONFIG
+        self.initial_budget = float(self.config.get("wait_time", 6))
+        self.min_budget = float(self.config.get("ready_timeout_min", 2))
+        self.max_budget = float(self.config.get("ready_timeout_max", 15))
+        self.margin = float(self.config.get("ready_p95_margin", 1.5))
+        self.min_samples = int(self.config.get("ready_min_samples", 5))
+        self._samples = deque(maxlen=int(self.config.get("ready_window", 200)))
+        self._timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed, ready=True):
+        """记录一次页面加载耗时；超时按当时的预算记入，使预算可以向上调整"""
+        with self._lock:
+            self._samples.append(float(elapsed))
+            if not ready:
+                self._timeouts += 1
+
+    def percentile(self, pct):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(0, min(len(samples) - 1, int(round(pct / 100.0 * len(samples))) - 1))
+        return samples[rank]
+
+    def budget(self):
+        """当前等待上限（秒），样本不足时使用 wait_time"""
+        with self._lock:
+            enough = len(self._samples) >= self.min_samples
+        if not enough:
+            return min(max(self.initial_budget, self.min_budget), self.max_budget)
+        p95 = self.percentile(95)
+        return min(max(p95 * self.margin, self.min_budget), self.max_budget)
+
+    def summary(self):
+        with self._lock:
+            count = len(self._samples)
+            timeouts = self._timeouts
+        if not count:
+            return "页面就绪统计: 无样本"
+        return (
+            f"页面就绪统计: {count} 次, p50={self.percentile(50):.2f}s, "
+            f"p95={self.percentile(95):.2f}s, 超时 {timeouts} 次, "
+            f"当前等待上限 {self.budget():.2f}s"
+        )
+
+
+class PageTransferStats:
+    """累计每个角色页面的网络传输量与被拦截的请求数"""
+
+    def __init__(self):
+        self.pages = 0
+        self.totals = {"requests": 0, "bytes": 0, "blocked": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    def add(self, summary, new_page=False):
+        with self._lock:
+            if new_page:
+                self.pages += 1
+            for key in self.totals:
+                self.totals[key] += summary.get(key, 0)
+
+    def summary(self):
+        with self._lock:
+            pages = self.pages
+            totals = dict(self.totals)
+        if not pages:
+            return "网络传输统计: 无样本"
+        return (
+            f"网络传输统计: {pages} 个页面, 放行 {totals['requests']} 个请求 "
+            f"共 {totals['bytes'] / 1024 / 1024:.1f}MB (平均每页 {totals['bytes'] / pages / 1024:.0f}KB), "
+            f"拦截 {totals['blocked']} 个请求 (平均每页 {totals['blocked'] / pages:.1f} 个), "
+            f"失败 {totals['failed']} 个"
+        )
@@ -189,21 +189,35 @@ class PlatformUtils:
         logger.warning("Chrome browser not found. Please ensure Chrome is installed.")
         return None
 
-# Global platform utility instance
-platform_utils = PlatformUtils()
+# Global platform utility instance, created on first use so importing this
+# module stays cheap
+_platform_utils = None
+
+def get_platform_utils() -> PlatformUtils:
+    """Get the shared PlatformUtils instance"""
+    global _platform_utils
+    if _platform_utils is None:
+        _platform_utils = PlatformUtils()
+    return _platform_utils
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from utils.platform_utils import platform_utils` working
+    if name == "platform_utils":
+        return get_platform_utils()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_platform() -> str:
     """Get the current platform name"""
-    return platform_utils.get_platform()
+    return get_platform_utils().get_platform()
 
 def is_windows() -> bool:
     """Check if running on Windows"""
-    return platform_utils.is_windows()
+    return get_platform_utils().is_windows()
 
 def is_linux() -> bool:
     """Check if running on Linux"""
-    return platform_utils.is_linux()
+    return get_platform_utils().is_linux()
 
 def is_macos() -> bool:
     """Check if running on macOS"""
-    return platform_utils.is_macos()
+    return get_platform_utils().is_macos()
@@ -121,8 +121,8 @@ class ReportGenerator:
                 start_row = i
     
     def prepare_dataframe(self, all_records):
-        """准备数据框"""
-        if not all_records:
+        """准备数据框，all_records 可以是记录列表或 DataFrame"""
+        if all_records is None or len(all_records) == 0:
             logger.error("没有数据可生成报告")
             return None
         
@@ -0,0 +1,73 @@
+import time
+import heapq
+import random
+import threading
+from collections import deque
+
+
+class RetryQueue:
+    """多 worker 共享的抓取任务队列：先处理主队列，失败的任务按指数退避加抖动
+    延后重试，不阻塞其它角色"""
+
+    def __init__(self, jobs, max_attempts=3, base_delay=3.0, max_delay=60.0):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self._main = deque(jobs)
+        self._deferred = []  # (ready_at, seq, attempt, job)
+        self._seq = 0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def delay(self, attempt):
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return backoff + random.uniform(0, self.base_delay)
+
+    def _pop_ready(self):
+        if self._main:
+            self._in_flight += 1
+            return self._main.popleft(), 1
+        if self._deferred and self._deferred[0][0] <= time.time():
+            _, _, attempt, job = heapq.heappop(self._deferred)
+            self._in_flight += 1
+            return job, attempt
+        return None
+
+    def get(self):
+        """取下一个任务 (job, attempt)；全部任务结束后返回 None"""
+        with self._cond:
+            while True:
+                task = self._pop_ready()
+                if task is not None:
+                    return task
+                if self._deferred:
+                    self._cond.wait(self._deferred[0][0] - time.time())
+                    continue
+                if self._in_flight == 0:
+                    return None
+                self._cond.wait()
+
+    def try_get(self):
+        """不等待地取任务，当前没有可执行的任务时返回 None（用 finished 判断是否全部结束）"""
+        with self._cond:
+            return self._pop_ready()
+
+    def finished(self):
+        with self._cond:
+            return not self._main and not self._deferred and self._in_flight == 0
+
+    def task_done(self, job, attempt, failed):
+        """报告任务结果；可重试的失败会放入延后队列，返回延迟秒数，否则返回 None"""
+        with self._cond:
+            self._in_flight -= 1
+            delay = None
+            if failed and attempt < self.max_attempts:
+                delay = self.delay(attempt)
+                self._seq += 1
+                heapq.heappush(self._deferred, (time.time() + delay, self._seq, attempt + 1, job))
+            self._cond.notify_all()
+            return delay
+
+    def remaining(self):
+        with self._cond:
+            return len(self._main) + len(self._deferred)
@@ -0,0 +1,124 @@
+import re
+import math
+import threading
+from config.settings import DUNGEON_TIME_LIMIT
+
+RUN_TIME_PATTERN = re.compile(r"^(\d+):(\d{2})$")
+
+RUN_COLUMNS = ["副本", "限时层数", "通关时间", "是否限时"]
+UNKNOWN_TIME = "未知"
+
+
+class RunRecord:
+    """一条大秘境记录：副本编号、层数、通关秒数、是否限时。
+    用 __slots__ 存放，副本名只保存一份，时间只在进入时解析一次；
+    与原有的 {"副本", "限时层数", "通关时间", "是否限时"} 字典/表格列可以互相转换"""
+
+    __slots__ = ("dungeon_id", "level", "seconds", "timed")
+
+    _dungeon_names = []
+    _dungeon_ids = {}
+    _intern_lock = threading.Lock()
+
+    def __init__(self, dungeon, level, seconds, timed):
+        self.dungeon_id = self.intern_dungeon(dungeon)
+        self.level = level
+        self.seconds = seconds
+        self.timed = timed
+
+    @classmethod
+    def intern_dungeon(cls, name):
+        dungeon_id = cls._dungeon_ids.get(name)
+        if dungeon_id is None:
+            with cls._intern_lock:
+                dungeon_id = cls._dungeon_ids.get(name)
+                if dungeon_id is None:
+                    dungeon_id = len(cls._dungeon_names)
+                    cls._dungeon_names.append(name)
+                    cls._dungeon_ids[name] = dungeon_id
+        return dungeon_id
+
+    @property
+    def dungeon(self):
+        return self._dungeon_names[self.dungeon_id]
+
+    @property
+    def time(self):
+        return self.format_time(self.seconds)
+
+    @staticmethod
+    def parse_time(value):
+        """'mm:ss'（分钟可超过两位）转为秒数，无法识别时返回 None"""
+        if isinstance(value, str):
+            match = RUN_TIME_PATTERN.match(value.strip())
+            if match:
+                return int(match.group(1)) * 60 + int(match.group(2))
+        return None
+
+    @staticmethod
+    def format_time(seconds):
+        if seconds is None:
+            return UNKNOWN_TIME
+        return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+    @staticmethod
+    def is_on_time(dungeon, seconds):
+        limit = DUNGEON_TIME_LIMIT.get(dungeon)
+        return limit is not None and seconds is not None and seconds <= limit
+
+    @staticmethod
+    def _level(value):
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return None
+
+    @classmethod
+    def build(cls, dungeon, level, seconds, timed=None):
+        """timed 为 None 时按 DUNGEON_TIME_LIMIT 判断是否限时"""
+        if timed is None:
+            timed = cls.is_on_time(dungeon, seconds)
+        return cls(dungeon, cls._level(level), seconds, bool(timed))
+
+    @classmethod
+    def from_dict(cls, row):
+        """从字典或 DataFrame 行读取（限时层数可为 NaN，通关时间可为 '未知'）"""
+        return cls(
+            row["副本"],
+            cls._level(row.get("限时层数")),
+            cls.parse_time(row.get("通关时间")),
+            row.get("是否限时") == "是",
+        )
+
+    def to_dict(self):
+        return {
+            "副本": self.dungeon,
+            "限时层数": self.level,
+            "通关时间": self.time,
+            "是否限时": "是" if self.timed else "否",
+        }
+
+    @classmethod
+    def from_frame(cls, df):
+        return [cls.from_dict(row) for row in df[RUN_COLUMNS].to_dict("records")]
+
+    @staticmethod
+    def to_frame(records):
+        import pandas as pd
+        return pd.DataFrame([record.to_dict() for record in records], columns=RUN_COLUMNS)
+
+    def key(self):
+        return (self.dungeon_id, self.level, self.seconds)
+
+    def __eq__(self, other):
+        if not isinstance(other, RunRecord):
+            return NotImplemented
+        return self.key() == other.key() and self.timed == other.timed
+
+    def __hash__(self):
+        return hash((self.key(), self.timed))
+
+    def __repr__(self):
+        return f"RunRecord({self.dungeon!r}, {self.level!r}, {self.time!r}, timed={self.timed})"
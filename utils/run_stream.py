@@ -0,0 +1,106 @@
+import os
+import json
+import threading
+from config.settings import FILE_PATHS
+from utils.run_record import RunRecord, RUN_COLUMNS
+
+IDENTITY_COLUMNS = ["玩家", "角色名", "服务器"]
+
+
+def normalize(job, records):
+    """把一个角色的记录转换为紧凑的行：身份信息 + RunRecord 的数值字段"""
+    for record in records:
+        run = RunRecord.from_dict(record)
+        yield {
+            "index": job.index,
+            "player": job.player,
+            "name": job.name,
+            "server": job.server,
+            "dungeon": run.dungeon,
+            "level": run.level,
+            "seconds": run.seconds,
+            "timed": run.timed,
+        }
+
+
+class RunAggregates:
+    """随记录写入增量更新的汇总：按副本统计次数、限时次数、平均/最高层数"""
+
+    def __init__(self):
+        self.characters = 0
+        self.runs = 0
+        self.timed = 0
+        self.dungeons = {}  # dungeon -> {runs, timed, level_sum, level_count, best}
+
+    def add_character(self):
+        self.characters += 1
+
+    def add(self, row):
+        self.runs += 1
+        self.timed += row["timed"]
+        stat = self.dungeons.setdefault(
+            row["dungeon"], {"runs": 0, "timed": 0, "level_sum": 0, "level_count": 0, "best": None}
+        )
+        stat["runs"] += 1
+        stat["timed"] += row["timed"]
+        if row["level"] is not None:
+            stat["level_sum"] += row["level"]
+            stat["level_count"] += 1
+            stat["best"] = max(stat["best"] or 0, row["level"])
+
+    def summary(self):
+        lines = [f"汇总: {self.characters} 个角色有数据, {self.runs} 条记录, 限时 {self.timed} 条"]
+        for dungeon, stat in sorted(self.dungeons.items(), key=lambda item: -item[1]["runs"]):
+            avg = stat["level_sum"] / stat["level_count"] if stat["level_count"] else 0
+            best = f"+{stat['best']}" if stat["best"] is not None else "-"
+            lines.append(
+                f"  {dungeon}: {stat['runs']} 次, 限时 {stat['timed']} 次, 平均层数 {avg:.1f}, 最高 {best}"
+            )
+        return "\n".join(lines)
+
+
+class RunSink:
+    """抓取结果的落盘记录流（JSONL）：每个角色完成后立即追加并更新汇总，
+    爬虫不在内存中保留全部记录，报告阶段再从文件按角色顺序读回"""
+
+    def __init__(self, path=None):
+        self.path = path or FILE_PATHS["run_stream"]
+        self.aggregates = RunAggregates()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def append(self, job, records):
+        rows = list(normalize(job, records))
+        with self._lock:
+            for row in rows:
+                self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                self.aggregates.add(row)
+            if rows:
+                self.aggregates.add_character()
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def iter_rows(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def to_frame(self):
+        """读回全部记录，按角色在名单中的顺序排列，列与原先的明细表一致"""
+        import pandas as pd
+
+        self.close()
+        rows = []
+        for row in self.iter_rows():
+            run = RunRecord(row["dungeon"], row["level"], row["seconds"], row["timed"])
+            rows.append((row["index"], row["player"], row["name"], row["server"], *run.to_dict().values()))
+        df = pd.DataFrame(rows, columns=["index", *IDENTITY_COLUMNS, *RUN_COLUMNS])
+        return df.sort_values("index", kind="stable").drop(columns="index").reset_index(drop=True)
@@ -0,0 +1,98 @@
+"""
+启动耗时基准 - 用 python -X importtime 测量各入口模块的导入耗时并与预算比较
+
+用法:
+  python -m utils.startup_benchmark                      # 测量全部入口，超出预算或导入失败时退出码为 1
+  python -m utils.startup_benchmark generate_report --runs 5 --top 10
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+from config.settings import STARTUP_BUDGET_MS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def parse_importtime(stderr, module):
+    """解析 -X importtime 输出，返回 (module 累计导入耗时 ms, {顶层包: 自身耗时 ms})。
+    子模块总是先于父模块输出，module 那一行之前缩进更深的连续行就是它导入的全部模块"""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append((int(match.group(1)), int(match.group(2)), len(match.group(3)), match.group(4)))
+
+    for end in range(len(rows) - 1, -1, -1):
+        self_us, cumulative_us, indent, name = rows[end]
+        if name == module and indent == 1:
+            break
+    else:
+        return None, {}
+
+    packages = defaultdict(float)
+    packages[module] += self_us / 1000
+    index = end - 1
+    while index >= 0 and rows[index][2] > 1:
+        packages[rows[index][3].split(".")[0]] += rows[index][0] / 1000
+        index -= 1
+    return cumulative_us / 1000, dict(packages)
+
+
+def measure(module, runs=3):
+    """多次测量取最快的一次，返回 (耗时 ms, 各包耗时, 错误信息)"""
+    best = (None, {}, None)
+    for _ in range(max(1, runs)):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "未知错误"
+            return None, {}, error
+        total, packages = parse_importtime(result.stderr, module)
+        if total is not None and (best[0] is None or total < best[0]):
+            best = (total, packages, None)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="测量入口模块的导入耗时")
+    parser.add_argument("modules", nargs="*", help="要测量的模块，默认 STARTUP_BUDGET_MS 中的全部入口")
+    parser.add_argument("--runs", type=int, default=3, help="每个模块测量次数，取最快一次")
+    parser.add_argument("--top", type=int, default=8, help="列出耗时最多的前几个包")
+    args = parser.parse_args(argv)
+
+    over_budget = []
+    failed = []
+    for module in args.modules or list(STARTUP_BUDGET_MS):
+        total, packages, error = measure(module, args.runs)
+        budget = STARTUP_BUDGET_MS.get(module)
+        if error:
+            print(f"{module}: 导入失败: {error}")
+            failed.append(module)
+            continue
+        status = ""
+        if budget is not None:
+            status = f"（预算 {budget}ms，{'超出' if total > budget else '通过'}）"
+            if total > budget:
+                over_budget.append(module)
+        print(f"{module}: {total:.1f}ms{status}")
+        for name, cost in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"    {name:<30s} {cost:8.1f}ms")
+
+    if failed:
+        print(f"导入失败: {', '.join(failed)}")
+    if over_budget:
+        print(f"超出启动耗时预算: {', '.join(over_budget)}")
+    return 1 if failed or over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())